@@ -2,16 +2,61 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from concord4ws import Concord4WSClient
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import CONF_DEVICE, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
+
+from .activity import Concord4ZoneActivity, async_remove_activity
+from .aggregates import Concord4PartitionIndex
+from .classification import SIGNAL_ZONE_TYPES_CHANGED, Concord4ZoneClassifier
+from .commands import Concord4CommandQueue
+from .connection import Concord4Connection
+from .const import (
+    CONF_DISPATCH_WINDOW,
+    CONF_TRANSPORT,
+    CONF_ZONE_TYPES,
+    DEFAULT_DISPATCH_WINDOW,
+    DOMAIN,
+    LOGGER,
+    TRANSPORT_SERIAL,
+)
+from .dispatcher import Concord4Dispatcher
+from .events import Concord4EventLog
+from .manager import async_get_manager
+from .metrics import Concord4Metrics
+from .serial_transport import Concord4SerialConnection
+from .services import async_setup_services
+from .snapshot import Concord4Snapshot, snapshot_from_state
+from .topology import Concord4TopologyTracker
+from .triggers import async_get_trigger_hub
+from .websocket_api import async_setup_websocket_api
+
+PLATFORMS: list[Platform] = [
+    Platform.ALARM_CONTROL_PANEL,
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+CONNECT_TIMEOUT = 30
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Concord4 WebSocket integration."""
+
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
 
-from .const import DOMAIN
-
-PLATFORMS: list[Platform] = [Platform.ALARM_CONTROL_PANEL, Platform.SENSOR]
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -19,25 +64,147 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
-    server = Concord4WSClient(entry.data["host"], entry.data["port"])
-    avialable = await server.test_connect()
+    metrics = Concord4Metrics()
+    if entry.data.get(CONF_TRANSPORT) == TRANSPORT_SERIAL:
+        # the client only keeps the panel state, the port is driven directly
+        server = Concord4WSClient(entry.data[CONF_DEVICE], 0)
+        connection: Concord4Connection = Concord4SerialConnection(
+            hass, async_get_manager(hass), server, metrics, entry.data[CONF_DEVICE]
+        )
+    else:
+        server = Concord4WSClient(entry.data["host"], entry.data["port"])
+        connection = Concord4Connection(hass, async_get_manager(hass), server, metrics)
+    # registered first, so it runs after every other unload callback
+    entry.async_on_unload(connection.async_release)
+    snapshot = Concord4Snapshot(hass, entry.entry_id)
+
+    # without a stored topology the entities can only be built from live state
+    if (topology := await snapshot.async_load()) is None:
+        try:
+            await connection.async_connect(CONNECT_TIMEOUT)
+        except TimeoutError as err:
+            await connection.async_stop()
+            raise ConfigEntryNotReady(
+                f"No panel state from {connection.uri}: {connection.last_error}"
+            ) from err
+
+        topology = snapshot_from_state(server.state)
+        await snapshot.async_save(topology)
+
+    dispatcher = Concord4Dispatcher(
+        hass,
+        entry.options.get(CONF_DISPATCH_WINDOW, DEFAULT_DISPATCH_WINDOW) / 1000,
+        metrics,
+    )
+
+    index = Concord4PartitionIndex(connection)
+    entry.async_on_unload(index.async_start(topology["zones"]))
+
+    activity = Concord4ZoneActivity(hass, entry.entry_id, connection)
+    await activity.async_load()
+    entry.async_on_unload(activity.async_start(topology["zones"]))
+
+    classifier = Concord4ZoneClassifier(entry.options.get(CONF_ZONE_TYPES, {}))
+    classifier.async_classify(topology["zones"])
+
+    events = Concord4EventLog()
+    entry.async_on_unload(events.async_start(connection))
+
+    entry.async_on_unload(
+        async_get_trigger_hub(hass).async_attach_connection(
+            topology["panel"]["serial_number"], connection
+        )
+    )
+
+    hass.data[DOMAIN][entry.entry_id] = {
+        "server": server,
+        "connection": connection,
+        "name": entry.data["name"],
+        "dispatcher": dispatcher,
+        "metrics": metrics,
+        "topology": topology,
+        "capture": None,
+        "index": index,
+        "activity": activity,
+        "classifier": classifier,
+        "options": _reload_options(entry),
+        "events": events,
+        "commands": {
+            partition["partition_number"]: Concord4CommandQueue(
+                connection, partition["partition_number"], events
+            )
+            for partition in topology["partitions"]
+        },
+    }
 
-    if not avialable:
-        raise ConfigEntryNotReady
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    await server.connect()
+    # platforms subscribe to topology changes during setup, so track them after
+    tracker = Concord4TopologyTracker(
+        hass, entry.entry_id, connection, index, activity, snapshot, topology
+    )
+    entry.async_on_unload(tracker.async_start())
 
-    hass.data[DOMAIN][entry.entry_id] = {"server": server, "name": entry.data["name"]}
+    if not connection.ready:
+        entry.async_create_background_task(
+            hass,
+            _async_connect_from_snapshot(connection),
+            f"concord4ws connect {entry.title}",
+        )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def _async_connect_from_snapshot(connection: Concord4Connection) -> None:
+    """Connect in the background; the topology tracker reconciles the entities."""
+
+    await connection.async_connect()
+    LOGGER.info("reconciled snapshot entities with live panel state")
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["connection"].async_stop()
+        data["dispatcher"].async_shutdown()
+        await data["activity"].async_save()
+
+        if data["capture"] is not None:
+            await data["capture"].async_stop()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and zone activity of a deleted config entry."""
+
+    await Concord4Snapshot(hass, entry.entry_id).async_remove()
+    await async_remove_activity(hass, entry.entry_id)
+
+
+def _reload_options(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the options that only take effect on a reload."""
+    return {
+        key: value for key, value in entry.options.items() if key != CONF_ZONE_TYPES
+    }
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading the entry unless only zone types changed."""
+
+    data = hass.data[DOMAIN][entry.entry_id]
+    if _reload_options(entry) != data["options"]:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # only the entities of retyped zones are updated, nothing reconnects
+    if changed := data["classifier"].async_set_overrides(
+        entry.options.get(CONF_ZONE_TYPES, {})
+    ):
+        async_dispatcher_send(
+            hass, SIGNAL_ZONE_TYPES_CHANGED.format(entry.entry_id), changed
+        )
@@ -0,0 +1,223 @@
+"""Persisted per-zone activity counters for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .aggregates import OPEN_ZONE_STATUSES
+from .connection import Concord4Connection
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+ACTIVITY_ATTRIBUTES = frozenset({"trips", "trips_today", "last_opened", "open_today"})
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, dict[str, Any]]]:
+    """Return the activity store of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.activity")
+
+
+async def async_remove_activity(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored counters of a deleted config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+class _ZoneActivity:
+    """Counters of one zone; timestamps are UTC epoch seconds."""
+
+    __slots__ = (
+        "day",
+        "last_opened",
+        "open_today",
+        "opened_at",
+        "trips",
+        "trips_today",
+    )
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        data = data or {}
+        self.trips: int = data.get("trips", 0)
+        self.trips_today: int = data.get("trips_today", 0)
+        self.day: int = data.get("day", 0)
+        self.last_opened: float | None = data.get("last_opened")
+        self.open_today: float = data.get("open_today", 0.0)
+        self.opened_at: float | None = data.get("opened_at")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Concord4ZoneActivity:
+    """Trip count, last open time and time open today of every zone.
+
+    Each zone callback moves the counters of that zone only, so the values
+    cost nothing to read and dashboards need no recorder history queries. The
+    counters are saved with a delay and survive restarts; a zone that changed
+    while Home Assistant was down is picked up without counting a trip.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, connection: Concord4Connection
+    ) -> None:
+        """Initialize the counters."""
+        self._connection = connection
+        self._server = connection.server
+        self._store = _store(hass, entry_id)
+        self._zones: dict[str, _ZoneActivity] = {}
+        self._untrack: dict[str, CALLBACK_TYPE] = {}
+        self._synced = False
+
+    async def async_load(self) -> None:
+        """Load the stored counters."""
+        stored = await self._store.async_load() or {}
+        self._zones = {zone_id: _ZoneActivity(data) for zone_id, data in stored.items()}
+
+    @callback
+    def async_start(self, zones: list[dict[str, Any]]) -> CALLBACK_TYPE:
+        """Track the given topology zones, returning a function to stop."""
+        unsubscribe = self._connection.async_add_listener(self._handle_availability)
+        self.async_add_zones(zones)
+        self._handle_availability()
+
+        @callback
+        def stop() -> None:
+            unsubscribe()
+            for untrack in self._untrack.values():
+                untrack()
+            self._untrack.clear()
+
+        return stop
+
+    async def async_save(self) -> None:
+        """Save the counters right away."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_add_zones(self, zones: list[dict[str, Any]]) -> None:
+        """Track zones added after the counters were started."""
+        for zone in zones:
+            zone_id = zone["id"]
+            activity = self._zones.setdefault(zone_id, _ZoneActivity())
+            self._untrack[zone_id] = self._async_track_zone(
+                zone["callback_id"], zone_id, activity
+            )
+
+            if self._synced:
+                self._sync_zone(zone_id, activity)
+
+    @callback
+    def async_remove_zones(self, zone_ids: list[str]) -> None:
+        """Stop tracking zones and drop their counters."""
+        for zone_id in zone_ids:
+            if (untrack := self._untrack.pop(zone_id, None)) is not None:
+                untrack()
+            self._zones.pop(zone_id, None)
+
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def attributes(self, zone_id: str) -> dict[str, Any]:
+        """Return the counters of a zone as state attributes."""
+        if (activity := self._zones.get(zone_id)) is None:
+            return {}
+
+        now = dt_util.utcnow().timestamp()
+        today = self._today()
+        open_today = activity.open_today if activity.day == today else 0.0
+        if activity.opened_at is not None:
+            open_today += now - max(activity.opened_at, self._midnight())
+
+        return {
+            "trips": activity.trips,
+            "trips_today": activity.trips_today if activity.day == today else 0,
+            "last_opened": dt_util.utc_from_timestamp(activity.last_opened)
+            if activity.last_opened is not None
+            else None,
+            "open_today": round(open_today),
+        }
+
+    @callback
+    def _async_track_zone(
+        self, callback_id: str, zone_id: str, activity: _ZoneActivity
+    ) -> CALLBACK_TYPE:
+        @callback
+        def handle_zone_update() -> None:
+            if self._synced:
+                self._update_zone(zone_id, activity)
+
+        self._server.register_callback(callback_id, handle_zone_update)
+
+        @callback
+        def untrack() -> None:
+            self._server.remove_callback(callback_id, handle_zone_update)
+
+        return untrack
+
+    @callback
+    def _handle_availability(self) -> None:
+        """Reconcile the stored counters with the first loaded panel state."""
+        if self._synced or not self._connection.ready:
+            return
+
+        self._synced = True
+        for zone_id in self._untrack:
+            self._sync_zone(zone_id, self._zones[zone_id])
+
+    def _sync_zone(self, zone_id: str, activity: _ZoneActivity) -> None:
+        """Adopt the current zone status without counting a trip."""
+        if (zone := self._server.state.zones.get(zone_id)) is None:
+            return
+
+        is_open = zone.zone_status in OPEN_ZONE_STATUSES
+        if is_open and activity.opened_at is None:
+            activity.opened_at = dt_util.utcnow().timestamp()
+        elif not is_open:
+            # the close time of a zone that closed while we were away is unknown
+            activity.opened_at = None
+
+    def _update_zone(self, zone_id: str, activity: _ZoneActivity) -> None:
+        """Count an open or close transition of a zone."""
+        if (zone := self._server.state.zones.get(zone_id)) is None:
+            return
+
+        is_open = zone.zone_status in OPEN_ZONE_STATUSES
+        if is_open == (activity.opened_at is not None):
+            return
+
+        now = dt_util.utcnow().timestamp()
+        if (today := self._today()) != activity.day:
+            activity.day = today
+            activity.trips_today = 0
+            activity.open_today = 0.0
+
+        if is_open:
+            activity.trips += 1
+            activity.trips_today += 1
+            activity.last_opened = now
+            activity.opened_at = now
+        else:
+            activity.open_today += now - max(activity.opened_at, self._midnight())
+            activity.opened_at = None
+
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the counters to store."""
+        return {
+            zone_id: activity.as_dict() for zone_id, activity in self._zones.items()
+        }
+
+    @staticmethod
+    def _today() -> int:
+        """Return the local date as an ordinal."""
+        return dt_util.now().date().toordinal()
+
+    @staticmethod
+    def _midnight() -> float:
+        """Return the start of the local day as a UTC timestamp."""
+        return dt_util.start_of_local_day().timestamp()
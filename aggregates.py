@@ -0,0 +1,167 @@
+"""Incremental per-partition zone aggregates for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from concord4ws.types import ZoneStatus
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .connection import Concord4Connection
+
+OPEN_ZONE_STATUSES: frozenset[ZoneStatus] = frozenset({"tripped"})
+FAULTED_ZONE_STATUSES: frozenset[ZoneStatus] = frozenset(
+    {"faulted", "alarm", "trouble"}
+)
+
+
+class Concord4PartitionIndex:
+    """Index of open and faulted zones per partition.
+
+    Built once from the panel state, then kept up to date from each zone
+    callback by moving only that zone between sets, so reading a count or the
+    ready-to-arm flag never iterates over the zones.
+    """
+
+    def __init__(self, connection: Concord4Connection) -> None:
+        """Initialize the index."""
+        self._connection = connection
+        self._server = connection.server
+        self._zone_status: dict[str, tuple[int, ZoneStatus]] = {}
+        self._zone_names: dict[str, str] = {}
+        self._open: dict[int, set[str]] = {}
+        self._faulted: dict[int, set[str]] = {}
+        self._listeners: dict[int, list[Callable[[], None]]] = {}
+        self._untrack: dict[str, CALLBACK_TYPE] = {}
+        self._built = False
+
+    @callback
+    def async_start(self, zones: list[dict[str, Any]]) -> CALLBACK_TYPE:
+        """Track the given topology zones, returning a function to stop."""
+        unsubscribe = self._connection.async_add_listener(self._handle_availability)
+        self.async_add_zones(zones)
+        self._handle_availability()
+
+        @callback
+        def stop() -> None:
+            unsubscribe()
+            self.async_remove_zones(list(self._untrack))
+
+        return stop
+
+    @callback
+    def async_add_zones(self, zones: list[dict[str, Any]]) -> None:
+        """Track topology zones added after the index was started."""
+        for zone in zones:
+            self._zone_names[zone["id"]] = zone["zone_text"].title()
+            self._untrack[zone["id"]] = self._async_track_zone(
+                zone["callback_id"], zone["id"]
+            )
+            if self._built:
+                self._update_zone(zone["id"])
+
+    @callback
+    def async_remove_zones(self, zone_ids: list[str]) -> None:
+        """Stop tracking zones, dropping them from the open and faulted sets."""
+        for zone_id in zone_ids:
+            if (untrack := self._untrack.pop(zone_id, None)) is not None:
+                untrack()
+            self._zone_names.pop(zone_id, None)
+
+            if (previous := self._zone_status.pop(zone_id, None)) is None:
+                continue
+
+            self._open.get(previous[0], set()).discard(zone_id)
+            self._faulted.get(previous[0], set()).discard(zone_id)
+            for listener in list(self._listeners.get(previous[0], ())):
+                listener()
+
+    @callback
+    def async_add_listener(
+        self, partition_number: int, listener: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for zone changes within a partition."""
+        listeners = self._listeners.setdefault(partition_number, [])
+        listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(listener)
+
+        return remove_listener
+
+    def open_zones(self, partition_number: int) -> set[str]:
+        """Return the ids of tripped zones in a partition."""
+        return self._open.get(partition_number, set())
+
+    def faulted_zones(self, partition_number: int) -> set[str]:
+        """Return the ids of faulted, alarming or troubled zones in a partition."""
+        return self._faulted.get(partition_number, set())
+
+    def ready_to_arm(self, partition_number: int) -> bool:
+        """Return True if no zone of the partition is open or faulted."""
+        return not self.open_zones(partition_number) and not self.faulted_zones(
+            partition_number
+        )
+
+    def zone_names(self, zone_ids: set[str]) -> list[str]:
+        """Return the sorted names of the given zones."""
+        return sorted(self._zone_names.get(zone_id, zone_id) for zone_id in zone_ids)
+
+    @callback
+    def _async_track_zone(self, callback_id: str, zone_id: str) -> CALLBACK_TYPE:
+        @callback
+        def handle_zone_update() -> None:
+            if self._built:
+                self._update_zone(zone_id)
+
+        self._server.register_callback(callback_id, handle_zone_update)
+
+        @callback
+        def untrack() -> None:
+            self._server.remove_callback(callback_id, handle_zone_update)
+
+        return untrack
+
+    @callback
+    def _handle_availability(self) -> None:
+        """Build the index the first time the panel state is loaded."""
+        if self._built or not self._connection.ready:
+            return
+
+        self._built = True
+        for zone_id in self._zone_names:
+            self._update_zone(zone_id, notify=False)
+
+        for listeners in self._listeners.values():
+            for listener in list(listeners):
+                listener()
+
+    def _update_zone(self, zone_id: str, notify: bool = True) -> None:
+        """Move a zone to the sets matching its current status."""
+        if (zone := self._server.state.zones.get(zone_id)) is None:
+            return
+
+        current = (zone.partition_number, zone.zone_status)
+        if (previous := self._zone_status.get(zone_id)) == current:
+            return
+
+        self._zone_status[zone_id] = current
+
+        if previous is not None:
+            self._open.get(previous[0], set()).discard(zone_id)
+            self._faulted.get(previous[0], set()).discard(zone_id)
+
+        if zone.zone_status in OPEN_ZONE_STATUSES:
+            self._open.setdefault(zone.partition_number, set()).add(zone_id)
+        elif zone.zone_status in FAULTED_ZONE_STATUSES:
+            self._faulted.setdefault(zone.partition_number, set()).add(zone_id)
+
+        if not notify:
+            return
+
+        for partition_number in {current[0], previous[0] if previous else current[0]}:
+            for listener in list(self._listeners.get(partition_number, ())):
+                listener()
@@ -1,6 +1,8 @@
 """Alarm Control Panel for the Concord4 WebSocket integration."""
 
-from concord4ws import Concord4WSClient
+from collections.abc import Coroutine
+from typing import Any
+
 from concord4ws.types import code_to_keypresses
 
 from homeassistant.components.alarm_control_panel import (
@@ -13,18 +15,27 @@ from homeassistant.components.alarm_control_panel.const import (
     CodeFormat,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
+from .commands import Concord4CommandQueue
+from .connection import Concord4Connection
 from .const import (
+    BYPASS_ZONES_SERVICE_SCHEMA,
+    CONF_OPTIMISTIC,
     DOMAIN,
     LOGGER,
     USER_CODE_SERVICE_SCHEMA,
     alarm_panel_identifier,
     alarm_panel_uid,
 )
+from .dispatcher import PRIORITY_PARTITION, Concord4Dispatcher
+from .entity import Concord4Entity
+from .events import Concord4EventLog
+from .topology import SIGNAL_TOPOLOGY_ADDED, active_partitions
 
 
 async def async_setup_entry(
@@ -32,16 +43,45 @@ async def async_setup_entry(
 ):
     """Add sensors for passed config_entry in HA."""
     name: str = hass.data[DOMAIN][config.entry_id]["name"]
-    server: Concord4WSClient = hass.data[DOMAIN][config.entry_id]["server"]
+    connection: Concord4Connection = hass.data[DOMAIN][config.entry_id]["connection"]
+    dispatcher: Concord4Dispatcher = hass.data[DOMAIN][config.entry_id]["dispatcher"]
+    topology: dict[str, Any] = hass.data[DOMAIN][config.entry_id]["topology"]
+    commands: dict[int, Concord4CommandQueue] = hass.data[DOMAIN][config.entry_id][
+        "commands"
+    ]
+    events: Concord4EventLog = hass.data[DOMAIN][config.entry_id]["events"]
+
+    @callback
+    def async_add_partitions(
+        zones: list[dict[str, Any]], partitions: list[dict[str, Any]]
+    ) -> None:
+        """Add an alarm panel for every partition with zones."""
+        for partition in partitions:
+            if partition["partition_number"] not in commands:
+                commands[partition["partition_number"]] = Concord4CommandQueue(
+                    connection, partition["partition_number"], events
+                )
 
-    async_add_entities(
-        [
-            Concord4AlarmPanel(
-                server, name, server.state.partitions[partition].partition_number
-            )
-            for partition in server.state.partitions
-            if len(server.state.partitions[partition].zones) > 0
-        ]
+        async_add_entities(
+            [
+                Concord4AlarmPanel(
+                    connection,
+                    dispatcher,
+                    commands[partition["partition_number"]],
+                    name,
+                    topology["panel"],
+                    partition,
+                    config.options.get(CONF_OPTIMISTIC, False),
+                )
+                for partition in partitions
+            ]
+        )
+
+    async_add_partitions(topology["zones"], active_partitions(topology))
+    config.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_TOPOLOGY_ADDED.format(config.entry_id), async_add_partitions
+        )
     )
 
     platform = entity_platform.async_get_current_platform()
@@ -66,6 +106,20 @@ async def async_setup_entry(
         USER_CODE_SERVICE_SCHEMA,
         "async_alarm_arm_away_silent",
     )
+    platform.async_register_entity_service(
+        "bypass_zones",
+        BYPASS_ZONES_SERVICE_SCHEMA,
+        "async_bypass_zones",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+PartitionArmingLevelStateMapping: dict[str, AlarmControlPanelState] = {
+    "off": AlarmControlPanelState.DISARMED,
+    "away": AlarmControlPanelState.ARMED_AWAY,
+    "stay": AlarmControlPanelState.ARMED_HOME,
+    "home": AlarmControlPanelState.ARMED_HOME,
+}
 
 
 class _Concord4PanelConfig:
@@ -74,101 +128,123 @@ class _Concord4PanelConfig:
         self.partition_number = partition_number
 
 
-class Concord4AlarmPanel(AlarmControlPanelEntity):
+class Concord4AlarmPanel(Concord4Entity, AlarmControlPanelEntity):
     """Representation of a Concord4 Alarm Panel."""
 
-    should_poll: bool = False
-    _attr_has_entity_name = True
     _attr_code_arm_required = True
     _attr_supported_features = (
         AlarmControlPanelEntityFeature.ARM_HOME
         | AlarmControlPanelEntityFeature.ARM_AWAY
     )
     _attr_code_format = CodeFormat.NUMBER
-
-    def __init__(self, server: Concord4WSClient, name: str, partition_number: int):
+    metric_kind = "partition"
+    dispatch_priority = PRIORITY_PARTITION
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        commands: Concord4CommandQueue,
+        name: str,
+        panel: dict[str, Any],
+        partition: dict[str, Any],
+        optimistic: bool = False,
+    ):
         """Initialize the alarm panel."""
 
-        LOGGER.debug(f"Creating alarm panel for {name} partition {partition_number}")
+        partition_number: int = partition["partition_number"]
+        LOGGER.debug("creating alarm panel for %s partition %s", name, partition_number)
 
-        self._server: Concord4WSClient = server
+        super().__init__(connection, dispatcher, partition["callback_id"])
+        self._commands = commands
+        self._optimistic = optimistic
+        # state shown while an optimistic command waits for the panel
+        self._transition: AlarmControlPanelState | None = None
         self._config = _Concord4PanelConfig(
             panel_name=name, partition_number=partition_number
         )
 
-        self._attr_unique_id = alarm_panel_uid(
-            self._server.state.panel.serial_number, partition_number
-        )
+        self._attr_unique_id = alarm_panel_uid(panel["serial_number"], partition_number)
         self.entity_description = AlarmControlPanelEntityDescription(
-            key=alarm_panel_identifier(
-                self._server.state.panel.serial_number, partition_number
-            ),
+            key=alarm_panel_identifier(panel["serial_number"], partition_number),
             name="Alarm Panel"
             if partition_number == 1
             else f"Partition {partition_number} Alarm Panel",
         )
-
-    @property
-    def device_info(self):
-        """Return information to link this entity with the correct device."""
-        return DeviceInfo(
+        self._attr_device_info = DeviceInfo(
             identifiers={
                 (
                     DOMAIN,
                     alarm_panel_identifier(
-                        self._server.state.panel.serial_number,
-                        self._config.partition_number,
+                        panel["serial_number"], self._config.partition_number
                     ),
                 )
             },
             manufacturer="GE",
-            model=self._server.state.panel.panel_type.capitalize()
-            if self._server.state.panel.panel_type is not None
+            model=panel["panel_type"].capitalize()
+            if panel["panel_type"] is not None
             else "Concord",
             name=self._config.panel_name,
-            serial_number=self._server.state.panel.serial_number,
-            hw_version=self._server.state.panel.hardware_revision,
-            sw_version=self._server.state.panel.software_revision,
-        )
-
-    @property
-    def available(self) -> bool:
-        """Return True if websocket server (and by extension the alarm panel) is available."""
-        return self._server.connected
-
-    async def async_added_to_hass(self):
-        """Run when this Entity has been added to HA."""
-        self._server.register_callback(
-            self._get_partition().callback_id(), self.async_write_ha_state
-        )
-
-    async def async_will_remove_from_hass(self):
-        """Entity being removed from hass."""
-        self._server.remove_callback(
-            self._get_partition().callback_id(), self.async_write_ha_state
+            serial_number=panel["serial_number"],
+            hw_version=panel["hardware_revision"],
+            sw_version=panel["software_revision"],
         )
 
     @property
     def state(self) -> str | None:
         """Return the state of the device."""
+        return self._render()
+
+    def _render(self) -> AlarmControlPanelState | None:
+        """Return the alarm state for the current arming level."""
+        if self._transition is not None:
+            return self._transition
+
+        if (partition := self._get_partition()) is None:
+            return None
+
+        return PartitionArmingLevelStateMapping.get(partition.arming_level)
+
+    async def _async_command(
+        self, transition: AlarmControlPanelState, command: Coroutine[Any, Any, None]
+    ) -> None:
+        """Run a command, showing the transition state until the panel confirms.
+
+        If the panel does not confirm in time, the state rolls back to the
+        reported arming level and the error is raised to the caller.
+        """
+        if not self._optimistic:
+            await command
+            return
+
+        self._set_transition(transition)
+        try:
+            await command
+        except HomeAssistantError:
+            LOGGER.warning(
+                "Partition %s did not confirm, rolling back from %s",
+                self._config.partition_number,
+                transition,
+            )
+            raise
+        finally:
+            self._set_transition(None)
 
-        match self._get_partition().arming_level:
-            case "off":
-                return AlarmControlPanelState.DISARMED
-            case "away":
-                return AlarmControlPanelState.ARMED_AWAY
-            case "stay":
-                return AlarmControlPanelState.ARMED_HOME
-            case _:
-                return None
+    @callback
+    def _set_transition(self, transition: AlarmControlPanelState | None) -> None:
+        """Show or clear the transition state without waiting for the window."""
+        self._transition = transition
+        self._rendered = self._render()
+        self._dispatcher.async_schedule(self, immediate=True)
 
     async def async_alarm_disarm(self, code=None) -> None:
         """Send disarm command."""
         if code is None:
             raise Concord4PanelError("Code required to disarm")
 
-        await self._server.disarm(
-            code=code_to_keypresses(code), partition=self._config.partition_number
+        await self._async_command(
+            AlarmControlPanelState.DISARMING,
+            self._commands.async_disarm(code_to_keypresses(code)),
         )
 
     async def async_handle_alarm_arm_home(self, code=None) -> None:
@@ -176,10 +252,9 @@ class Concord4AlarmPanel(AlarmControlPanelEntity):
         if code is None:
             raise Concord4PanelError("Code required to arm home")
 
-        await self._server.arm(
-            "stay",
-            code=code_to_keypresses(code),
-            partition=self._config.partition_number,
+        await self._async_command(
+            AlarmControlPanelState.ARMING,
+            self._commands.async_arm("stay", code_to_keypresses(code)),
         )
 
     async def async_alarm_arm_home_instant(self, code: str | None = None) -> None:
@@ -187,11 +262,9 @@ class Concord4AlarmPanel(AlarmControlPanelEntity):
         if code is None:
             raise Concord4PanelError("Code required to arm home")
 
-        await self._server.arm(
-            "stay",
-            code=code_to_keypresses(code),
-            level="instant",
-            partition=self._config.partition_number,
+        await self._async_command(
+            AlarmControlPanelState.ARMING,
+            self._commands.async_arm("stay", code_to_keypresses(code), level="instant"),
         )
 
     async def async_alarm_arm_home_silent(self, code: str | None = None) -> None:
@@ -199,11 +272,9 @@ class Concord4AlarmPanel(AlarmControlPanelEntity):
         if code is None:
             raise Concord4PanelError("Code required to arm home")
 
-        await self._server.arm(
-            "stay",
-            code=code_to_keypresses(code),
-            level="silent",
-            partition=self._config.partition_number,
+        await self._async_command(
+            AlarmControlPanelState.ARMING,
+            self._commands.async_arm("stay", code_to_keypresses(code), level="silent"),
         )
 
     async def async_handle_alarm_arm_away(self, code=None) -> None:
@@ -211,10 +282,9 @@ class Concord4AlarmPanel(AlarmControlPanelEntity):
         if code is None:
             raise Concord4PanelError("Code required to arm away")
 
-        await self._server.arm(
-            "away",
-            code=code_to_keypresses(code),
-            partition=self._config.partition_number,
+        await self._async_command(
+            AlarmControlPanelState.ARMING,
+            self._commands.async_arm("away", code_to_keypresses(code)),
         )
 
     async def async_alarm_arm_away_instant(self, code: str | None = None) -> None:
@@ -222,11 +292,9 @@ class Concord4AlarmPanel(AlarmControlPanelEntity):
         if code is None:
             raise Concord4PanelError("Code required to arm away")
 
-        await self._server.arm(
-            "away",
-            code=code_to_keypresses(code),
-            level="instant",
-            partition=self._config.partition_number,
+        await self._async_command(
+            AlarmControlPanelState.ARMING,
+            self._commands.async_arm("away", code_to_keypresses(code), level="instant"),
         )
 
     async def async_alarm_arm_away_silent(self, code: str | None = None) -> None:
@@ -234,15 +302,45 @@ class Concord4AlarmPanel(AlarmControlPanelEntity):
         if code is None:
             raise Concord4PanelError("Code required to arm away")
 
-        await self._server.arm(
-            "away",
-            code=code_to_keypresses(code),
-            level="silent",
-            partition=self._config.partition_number,
+        await self._async_command(
+            AlarmControlPanelState.ARMING,
+            self._commands.async_arm("away", code_to_keypresses(code), level="silent"),
         )
 
+    async def async_bypass_zones(
+        self, code: str | None = None, zones: list[int] | None = None
+    ) -> dict[str, Any]:
+        """Bypass zones of the partition in one keypress sequence."""
+        if code is None:
+            raise Concord4PanelError("Code required to bypass zones")
+
+        if not self._connection.ready:
+            raise Concord4PanelError("Panel state not loaded")
+
+        unknown = [
+            zone
+            for zone in zones or []
+            if f"p{self._config.partition_number}-z{zone}"
+            not in self._server.state.zones
+        ]
+        if unknown:
+            raise ServiceValidationError(
+                f"Zones {unknown} are not in partition {self._config.partition_number}"
+            )
+
+        results = await self._commands.async_bypass(
+            code_to_keypresses(code), zones or []
+        )
+
+        return {
+            "zones": [
+                {"zone": zone, "bypassed": bypassed}
+                for zone, bypassed in results.items()
+            ]
+        }
+
     def _get_partition(self):
-        return self._server.state.partitions[self._config.partition_number]
+        return self._server.state.partitions.get(self._config.partition_number)
 
 
 class Concord4PanelError(HomeAssistantError):
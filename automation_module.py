@@ -0,0 +1,295 @@
+"""Concord 4 automation module protocol.
+
+The automation module speaks 9600 baud, 8 data bits, odd parity. Every frame
+is a line feed followed by the ASCII hex of a length byte, the payload and a
+checksum byte; each side acknowledges a valid frame with ACK and a corrupt one
+with NAK.
+
+Panel frames are translated into the JSON messages a Concord4WS server would
+send for them, so the same client state model handles both transports.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+LF = 0x0A
+ACK = 0x06
+NAK = 0x15
+
+# panel to automation module commands
+CMD_PANEL_TYPE = 0x01
+CMD_ZONE_DATA = 0x03
+CMD_PARTITION_DATA = 0x04
+CMD_EQPT_LIST_DONE = 0x08
+CMD_ZONE_STATUS = 0x21
+CMD_EVENT = 0x22
+SUBCMD_ARMING_LEVEL = 0x01
+
+# automation module to panel commands
+CMD_EQPT_LIST_REQUEST = 0x02
+CMD_KEYPRESS = 0x40
+EQPT_LIST_ALL = 0x00
+EQPT_LIST_PARTITIONS = 0x04
+
+PanelTypes: dict[int, str] = {
+    0x14: "concord",
+    0x0B: "concordExpress",
+    0x1E: "concordExpress4",
+    0x0E: "concordEuro",
+}
+ZoneTypes: dict[int, str] = {0: "hardwired", 1: "rf", 2: "touchpad"}
+ArmingLevels: dict[int, str] = {
+    1: "zoneTest",
+    2: "off",
+    3: "home",
+    4: "away",
+    5: "night",
+    6: "silent",
+}
+# zone state bits, the first one set decides the reported status
+ZoneStatusBits: tuple[tuple[int, str], ...] = (
+    (0x10, "bypassed"),
+    (0x04, "alarm"),
+    (0x08, "trouble"),
+    (0x02, "faulted"),
+    (0x01, "tripped"),
+)
+KeypressCodes: dict[str, int] = {
+    **{str(digit): digit for digit in range(10)},
+    "*": 0x0A,
+    "#": 0x0B,
+    "policePanic": 0x0C,
+    "auxPanic": 0x0D,
+    "firePanic": 0x0E,
+    "lightsOn": 0x10,
+    "lightsOff": 0x11,
+    "lightsToggle": 0x12,
+    "keyswitchOn": 0x13,
+    "keyswitchOff": 0x14,
+    "keyswitchToggle": 0x15,
+    "fireTPAcknowledge": 0x1C,
+    "fireTPSilence": 0x1D,
+    "fireTPFireTest": 0x1E,
+    "fireTPSmokeReset": 0x1F,
+    "keyfobDisarm": 0x20,
+    "keyfobArm": 0x21,
+    "keyfobLights": 0x22,
+    "keyfobStar": 0x23,
+    "keyfobArmDisarm": 0x24,
+    "keyfobLightsStar": 0x25,
+    "keyfobLongLights": 0x26,
+    "keyfobDirectArmLevelThree": 0x27,
+    "keyfobDirectArmLevelTwo": 0x28,
+    "keyfobArmStar": 0x29,
+    "keyfobDisarmLights": 0x2A,
+    "TPAKey": 0x2C,
+    "TPBKey": 0x30,
+    "TPCKey": 0x2D,
+    "TPDKey": 0x33,
+    "TPEKey": 0x2E,
+    "TPFKey": 0x36,
+}
+# character tokens of zone and partition text; word tokens are skipped
+TextTokens: dict[int, str] = {
+    **{digit: str(digit) for digit in range(10)},
+    0x0C: "#",
+    0x0D: ":",
+    0x0E: "/",
+    0x0F: "?",
+    0x10: ".",
+    **{0x11 + offset: chr(ord("A") + offset) for offset in range(26)},
+}
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Return the serial frame carrying `payload`."""
+    body = bytes([len(payload) + 1, *payload])
+    return b"\n" + (body + bytes([sum(body) & 0xFF])).hex().upper().encode()
+
+
+def decode_text(tokens: bytes) -> str:
+    """Return the text of character tokens, joining words with spaces."""
+    return " ".join("".join(TextTokens.get(token, " ") for token in tokens).split())
+
+
+class Concord4FrameDecoder:
+    """Split a serial byte stream into checksummed payloads."""
+
+    def __init__(self) -> None:
+        """Initialize the decoder."""
+        self._frame: bytearray | None = None
+        self.errors = 0
+
+    def feed(self, data: bytes) -> list[bytes | int | None]:
+        """Return the payloads, ACK and NAK bytes completed by `data`.
+
+        A corrupt frame is returned as None, so the caller can NAK it.
+        """
+        results: list[bytes | int | None] = []
+
+        for byte in data:
+            if byte == LF:
+                self._frame = bytearray()
+            elif self._frame is None:
+                if byte in (ACK, NAK):
+                    results.append(byte)
+            elif chr(byte) in "0123456789ABCDEFabcdef":
+                self._frame.append(byte)
+            else:
+                self._frame = None
+                self.errors += 1
+                results.append(None)
+                continue
+
+            if self._frame is not None and self._complete():
+                body = bytes.fromhex(self._frame.decode())
+                self._frame = None
+                if len(body) < 3 or sum(body[:-1]) & 0xFF != body[-1]:
+                    self.errors += 1
+                    results.append(None)
+                else:
+                    results.append(body[1:-1])
+
+        return results
+
+    def _complete(self) -> bool:
+        """Return True once the current frame holds its announced length."""
+        frame = self._frame
+        if len(frame) < 2 or len(frame) % 2:
+            return False
+
+        return len(frame) >= 2 * (int(frame[:2], 16) + 1)
+
+
+class Concord4SerialPanel:
+    """Translate automation module frames into Concord4WS JSON messages."""
+
+    def __init__(self) -> None:
+        """Initialize an empty panel model."""
+        self.panel: dict[str, Any] = {
+            "panelType": "concord",
+            "hardwareRevision": "",
+            "softwareRevision": "",
+            "serialNumber": "",
+        }
+        self.zones: dict[str, dict[str, Any]] = {}
+        self.partitions: dict[int, dict[str, Any]] = {}
+        self.complete = False
+
+    def handle(self, payload: bytes) -> list[str]:
+        """Update the model and return the messages the payload amounts to."""
+        command = payload[0]
+        data = payload[1:]
+
+        if command == CMD_PANEL_TYPE and len(data) >= 9:
+            self.panel = {
+                "panelType": PanelTypes.get(data[0], "concord"),
+                "hardwareRevision": f"{data[1]}.{data[2]}",
+                "softwareRevision": f"{data[3]}.{data[4]}",
+                "serialNumber": str(int.from_bytes(data[5:9], "big")),
+            }
+            return self._message("panelType", self.panel)
+
+        if command == CMD_ZONE_DATA and len(data) >= 7:
+            zone = {
+                "partitionNumber": data[0],
+                "areaNumber": data[1],
+                "groupNumber": data[2],
+                "zoneNumber": int.from_bytes(data[3:5], "big"),
+                "zoneType": ZoneTypes.get(data[5], "hardwired"),
+                "zoneStatus": _zone_status(data[6]),
+                "zoneText": "",
+            }
+            zone["zoneText"] = decode_text(data[7:]) or f"Zone {zone['zoneNumber']}"
+            zone_id = f"p{zone['partitionNumber']}-z{zone['zoneNumber']}"
+            self.zones[zone_id] = zone
+            partition = self.partitions.get(zone["partitionNumber"])
+            if partition is not None and zone_id not in partition["zones"]:
+                partition["zones"].append(zone_id)
+            return self._message("zoneData", zone)
+
+        if command == CMD_PARTITION_DATA and len(data) >= 3:
+            partition = {
+                "partitionNumber": data[0],
+                "areaNumber": data[1],
+                "armingLevel": ArmingLevels.get(data[2], "off"),
+                "zones": [
+                    zone_id
+                    for zone_id, zone in self.zones.items()
+                    if zone["partitionNumber"] == data[0]
+                ],
+            }
+            self.partitions[data[0]] = partition
+            return self._message("partitionData", partition)
+
+        if command == CMD_EQPT_LIST_DONE:
+            self.complete = True
+            return [self.state_message()]
+
+        if command == CMD_ZONE_STATUS and len(data) >= 5:
+            zone_id = f"p{data[0]}-z{int.from_bytes(data[2:4], 'big')}"
+            if (zone := self.zones.get(zone_id)) is None:
+                return []
+
+            zone["zoneStatus"] = _zone_status(data[4])
+            return self._message(
+                "zoneStatus",
+                {
+                    "partitionNumber": zone["partitionNumber"],
+                    "areaNumber": zone["areaNumber"],
+                    "zoneNumber": zone["zoneNumber"],
+                    "zoneStatus": zone["zoneStatus"],
+                },
+            )
+
+        if command == CMD_EVENT and data[:1] == bytes([SUBCMD_ARMING_LEVEL]):
+            if len(data) < 6 or (partition := self.partitions.get(data[1])) is None:
+                return []
+
+            partition["armingLevel"] = ArmingLevels.get(data[5], "off")
+            return self._message(
+                "armingLevel",
+                {
+                    "partitionNumber": partition["partitionNumber"],
+                    "areaNumber": partition["areaNumber"],
+                    "armingLevel": partition["armingLevel"],
+                },
+            )
+
+        return []
+
+    def state_message(self) -> str:
+        """Return the full state message of the panel."""
+        return json.dumps(
+            {
+                "type": "state",
+                "data": {
+                    "panel": self.panel,
+                    "zones": self.zones,
+                    "partitions": self.partitions,
+                    "groups": {},
+                },
+            }
+        )
+
+    def _message(self, message_type: str, data: dict[str, Any]) -> list[str]:
+        """Return a panel message, held back until the equipment list is done."""
+        if not self.complete:
+            return []
+
+        return [
+            json.dumps(
+                {"type": "message", "data": {"type": message_type, "data": data}}
+            )
+        ]
+
+
+def _zone_status(bits: int) -> str:
+    """Return the zone status for a zone state bitmask."""
+    for bit, status in ZoneStatusBits:
+        if bits & bit:
+            return status
+
+    return "normal"
@@ -0,0 +1,184 @@
+"""Binary sensor platform for Concord4WS integration."""
+
+from typing import Any
+
+from concord4ws.types import ZoneStatus
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .aggregates import Concord4PartitionIndex
+from .classification import Concord4ZoneClassifier, ZoneSensorType
+from .connection import Concord4Connection
+from .const import CONF_ZONE_BINARY_SENSORS, DOMAIN, alarm_panel_identifier
+from .dispatcher import Concord4Dispatcher
+from .entity import (
+    Concord4PartitionIndexEntity,
+    Concord4ZoneConfig,
+    Concord4ZoneEntity,
+)
+from .topology import SIGNAL_TOPOLOGY_ADDED, active_partitions
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, config: ConfigEntry, async_add_entities
+):
+    """Add binary sensors for passed config_entry in HA."""
+    name: str = hass.data[DOMAIN][config.entry_id]["name"]
+    connection: Concord4Connection = hass.data[DOMAIN][config.entry_id]["connection"]
+    dispatcher: Concord4Dispatcher = hass.data[DOMAIN][config.entry_id]["dispatcher"]
+    index: Concord4PartitionIndex = hass.data[DOMAIN][config.entry_id]["index"]
+    topology: dict[str, Any] = hass.data[DOMAIN][config.entry_id]["topology"]
+    classifier: Concord4ZoneClassifier = hass.data[DOMAIN][config.entry_id][
+        "classifier"
+    ]
+    serial_number: str = topology["panel"]["serial_number"]
+
+    zone_binary_sensors = config.options.get(CONF_ZONE_BINARY_SENSORS, False)
+
+    @callback
+    def async_add_topology(
+        zones: list[dict[str, Any]], partitions: list[dict[str, Any]]
+    ) -> None:
+        """Add binary sensors for new zones and partitions."""
+        async_add_entities(
+            [
+                PartitionReadySensor(
+                    connection,
+                    dispatcher,
+                    index,
+                    serial_number,
+                    partition["partition_number"],
+                )
+                for partition in partitions
+            ]
+        )
+
+        if zone_binary_sensors:
+            async_add_entities(
+                [
+                    ZoneBinarySensor(
+                        connection,
+                        dispatcher,
+                        name,
+                        serial_number,
+                        zone,
+                        classifier.zone_type(zone["id"], zone["zone_text"].title()),
+                    )
+                    for zone in zones
+                ]
+            )
+
+    async_add_topology(topology["zones"], active_partitions(topology))
+    config.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_TOPOLOGY_ADDED.format(config.entry_id), async_add_topology
+        )
+    )
+
+
+ZoneSensorTypeDeviceClassMapping: dict[ZoneSensorType, BinarySensorDeviceClass] = {
+    "motion": BinarySensorDeviceClass.MOTION,
+    "window": BinarySensorDeviceClass.WINDOW,
+    "glass_break": BinarySensorDeviceClass.SAFETY,
+    "sliding_door": BinarySensorDeviceClass.DOOR,
+    "door": BinarySensorDeviceClass.DOOR,
+}
+ZoneStatusIsOnMapping: dict[ZoneStatus, bool | None] = {
+    "normal": False,
+    "tripped": True,
+    "faulted": True,
+    "alarm": True,
+    "trouble": False,
+    "bypassed": False,
+    "unknown": None,
+}
+
+
+class ZoneBinarySensor(Concord4ZoneEntity, BinarySensorEntity):
+    """Compact on/off representation of a zone."""
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        name: str,
+        serial_number: str,
+        zone: dict[str, Any],
+        sensor_type: ZoneSensorType,
+    ):
+        """Initialize the binary sensor."""
+
+        super().__init__(connection, dispatcher, zone["callback_id"])
+
+        self._config = Concord4ZoneConfig(
+            panel_name=name,
+            sensor_name=zone["zone_text"].title(),
+            zone_id=zone["id"],
+            partition_number=zone["partition_number"],
+            sensor_type=sensor_type,
+        )
+
+        self._attr_name = self._config.sensor_name
+        self._attr_device_class = ZoneSensorTypeDeviceClassMapping[sensor_type]
+        self._attr_unique_id = f"{serial_number}_{self._config.zone_id}_zone_binary"
+        self._attr_device_info = DeviceInfo(
+            identifiers={
+                (
+                    DOMAIN,
+                    alarm_panel_identifier(
+                        serial_number, self._config.partition_number
+                    ),
+                )
+            },
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the zone is open or tripped."""
+        return self._render()
+
+    def _apply_sensor_type(self, sensor_type: ZoneSensorType) -> None:
+        """Switch the device class to another sensor type."""
+        self._attr_device_class = ZoneSensorTypeDeviceClassMapping[sensor_type]
+
+    def _render(self) -> bool | None:
+        """Return the on/off state for the current zone status."""
+        if (zone := self._get_zone()) is None:
+            return None
+
+        return ZoneStatusIsOnMapping[zone.zone_status]
+
+
+class PartitionReadySensor(Concord4PartitionIndexEntity, BinarySensorEntity):
+    """Whether a partition has no open or faulted zones."""
+
+    _attr_name = "Ready to arm"
+    _attr_icon = "mdi:shield-check"
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        index: Concord4PartitionIndex,
+        serial_number: str,
+        partition_number: int,
+    ):
+        """Initialize the binary sensor."""
+        super().__init__(connection, dispatcher, index, serial_number, partition_number)
+        self._attr_unique_id = f"{serial_number}_p{partition_number}_ready_to_arm"
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if the partition is ready to arm."""
+        return self._render()
+
+    def _render(self) -> bool:
+        """Return the ready-to-arm flag."""
+        return self._index.ready_to_arm(self._partition_number)
@@ -0,0 +1,134 @@
+"""Record and replay raw Concord4WS traffic.
+
+Captures are gzip compressed JSON lines of `{"t": seconds, "m": frame}`, where
+`t` is the receive time relative to the start of the capture. Each flush
+appends a new gzip member, so a capture stays readable if HA stops mid-way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .connection import Concord4Connection
+
+FLUSH_INTERVAL = 5
+FLUSH_FRAMES = 500
+
+
+def read_capture(path: str) -> list[tuple[float, str]]:
+    """Read a capture file into (offset, frame) pairs."""
+    with gzip.open(path, "rt", encoding="utf-8") as capture:
+        return [
+            (record["t"], record["m"])
+            for record in map(json.loads, filter(None, map(str.strip, capture)))
+        ]
+
+
+def _append_capture(path: str, lines: list[str]) -> None:
+    """Append encoded records to a capture file."""
+    with gzip.open(path, "at", encoding="utf-8") as capture:
+        capture.writelines(lines)
+
+
+class Concord4CaptureRecorder:
+    """Append every frame received by a connection to a capture file.
+
+    Buffered frames are written by a single flush task at a time, which keeps
+    writing until the buffer is empty, so gzip members are appended in order.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        connection: Concord4Connection,
+        path: str,
+    ) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._entry = entry
+        self._connection = connection
+        self.path = path
+        self.frames = 0
+        self._started_at: float | None = None
+        self._buffer: list[str] = []
+        self._remove_listener: CALLBACK_TYPE | None = None
+        self._flush_handle: Any = None
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start recording frames."""
+        self._remove_listener = self._connection.async_add_frame_listener(
+            self._record_frame
+        )
+
+    async def async_stop(self) -> None:
+        """Stop recording and write out buffered frames."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._start_flush()
+        if self._flush_task is not None:
+            await self._flush_task
+
+    def _record_frame(self, message: Any, received_at: float) -> None:
+        """Buffer a frame, scheduling a flush."""
+        if self._started_at is None:
+            self._started_at = received_at
+
+        if isinstance(message, bytes):
+            message = message.decode()
+
+        self._buffer.append(
+            json.dumps(
+                {"t": round(received_at - self._started_at, 6), "m": message},
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+        self.frames += 1
+
+        if len(self._buffer) >= FLUSH_FRAMES:
+            self._schedule_flush(0)
+        elif self._flush_handle is None:
+            self._schedule_flush(FLUSH_INTERVAL)
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+
+        self._flush_handle = self._hass.loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """Start the flush task, unless one is still writing."""
+        self._flush_handle = None
+        if self._flush_task is not None or not self._buffer:
+            # a running task picks up the frames buffered meanwhile
+            return
+
+        self._flush_task = self._entry.async_create_background_task(
+            self._hass, self._async_flush(), f"concord4ws capture {self.path}"
+        )
+
+    async def _async_flush(self) -> None:
+        """Write buffered frames in the executor until none are left."""
+        try:
+            while self._buffer:
+                lines, self._buffer = self._buffer, []
+                await self._hass.async_add_executor_job(
+                    _append_capture, self.path, lines
+                )
+        finally:
+            self._flush_task = None
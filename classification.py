@@ -0,0 +1,86 @@
+"""Zone classification for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import re
+import typing
+from typing import Any
+
+from homeassistant.core import callback
+
+ZoneSensorType = typing.Literal[
+    "motion", "window", "glass_break", "sliding_door", "door"
+]
+ZONE_SENSOR_TYPES: tuple[ZoneSensorType, ...] = typing.get_args(ZoneSensorType)
+
+SIGNAL_ZONE_TYPES_CHANGED = "concord4ws_zone_types_changed_{}"
+
+# name patterns and the type they imply, earlier rules win over later ones
+ZONE_TYPE_RULES: tuple[tuple[str, ZoneSensorType], ...] = (
+    ("motion", "motion"),
+    ("window", "window"),
+    ("glass", "glass_break"),
+    ("sliding", "sliding_door"),
+)
+DEFAULT_ZONE_TYPE: ZoneSensorType = "door"
+
+_ZONE_TYPE_PATTERN = re.compile(
+    "|".join(
+        f"(?P<r{rule}>{pattern})" for rule, (pattern, _) in enumerate(ZONE_TYPE_RULES)
+    ),
+    re.IGNORECASE,
+)
+
+
+def zone_type_from_name(name: str) -> ZoneSensorType:
+    """Return the type implied by a zone name, scanning the name once."""
+    rules = [int(match.lastgroup[1:]) for match in _ZONE_TYPE_PATTERN.finditer(name)]
+    if not rules:
+        return DEFAULT_ZONE_TYPE
+
+    return ZONE_TYPE_RULES[min(rules)][1]
+
+
+class Concord4ZoneClassifier:
+    """Sensor type of every zone of a config entry.
+
+    A zone is classified once, from its per-zone override or else from its
+    name, and the result is kept for every entity of that zone. When the
+    overrides change, only the zones whose type changed are reported.
+    """
+
+    def __init__(self, overrides: dict[str, ZoneSensorType]) -> None:
+        """Initialize the classifier."""
+        self._overrides = dict(overrides)
+        self.zones: dict[str, tuple[str, ZoneSensorType]] = {}
+
+    @callback
+    def async_classify(self, zones: list[dict[str, Any]]) -> None:
+        """Classify topology zones up front."""
+        for zone in zones:
+            self.zone_type(zone["id"], zone["zone_text"].title())
+
+    def zone_type(self, zone_id: str, name: str) -> ZoneSensorType:
+        """Return the sensor type of a zone."""
+        if (known := self.zones.get(zone_id)) is not None and known[0] == name:
+            return known[1]
+
+        sensor_type = self._overrides.get(zone_id) or zone_type_from_name(name)
+        self.zones[zone_id] = (name, sensor_type)
+        return sensor_type
+
+    @callback
+    def async_set_overrides(
+        self, overrides: dict[str, ZoneSensorType]
+    ) -> dict[str, ZoneSensorType]:
+        """Apply new overrides, returning the zones whose type changed."""
+        self._overrides = dict(overrides)
+        changed: dict[str, ZoneSensorType] = {}
+
+        for zone_id, (name, sensor_type) in self.zones.items():
+            new_type = self._overrides.get(zone_id) or zone_type_from_name(name)
+            if new_type != sensor_type:
+                self.zones[zone_id] = (name, new_type)
+                changed[zone_id] = new_type
+
+        return changed
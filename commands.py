@@ -0,0 +1,281 @@
+"""Per-partition command queue for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any
+
+from concord4ws.types import (
+    ArmLevel,
+    ArmMode,
+    CommandSendableMessage,
+    ConcordKeypressCommand,
+    Keypress,
+    code_to_keypresses,
+)
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .connection import Concord4Connection
+from .const import LOGGER
+from .events import Concord4EventLog
+
+COMMAND_TIMEOUT = 15
+
+# arming levels reported by the panel once an arm or disarm command took effect
+ArmModeArmingLevels: dict[ArmMode, frozenset[str]] = {
+    "stay": frozenset({"stay", "home", "night"}),
+    "away": frozenset({"away"}),
+}
+DisarmArmingLevels = frozenset({"off"})
+
+
+class Concord4CommandQueue:
+    """Serialize the commands of a partition and confirm them.
+
+    Commands run one at a time, so keypress sequences of concurrent callers
+    cannot interleave. A command identical to one still waiting in the queue
+    is collapsed into it. A command is confirmed once the partition reports an
+    arming level or zone status it should lead to, or fails after
+    `COMMAND_TIMEOUT` seconds.
+    """
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        partition_number: int,
+        events: Concord4EventLog | None = None,
+    ) -> None:
+        """Initialize the queue."""
+        self._connection = connection
+        self._server = connection.server
+        self._metrics = connection.metrics
+        self._events = events
+        self.partition_number = partition_number
+        self._callback_id = f"p{partition_number}"
+        self._lock = asyncio.Lock()
+        self._waiting: dict[tuple, asyncio.Future[None]] = {}
+
+        self.sent = 0
+        self.confirmed = 0
+        self.collapsed = 0
+        self.timed_out = 0
+        self.failed = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return queue counters."""
+        return {
+            "waiting": len(self._waiting),
+            "sent": self.sent,
+            "confirmed": self.confirmed,
+            "collapsed": self.collapsed,
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+        }
+
+    async def async_arm(
+        self, mode: ArmMode, code: list[Keypress], level: ArmLevel | None = None
+    ) -> None:
+        """Arm the partition and wait for the panel to confirm."""
+        expected = ArmModeArmingLevels[mode]
+        if level == "silent":
+            expected |= {"silent"}
+
+        await self.async_submit(
+            f"arm_{mode}",
+            ("arm", mode, level, tuple(code)),
+            [self._callback_id],
+            lambda: self._arming_level() in expected,
+            lambda: self._server.arm(
+                mode, code=code, level=level, partition=self.partition_number
+            ),
+        )
+
+    async def async_disarm(self, code: list[Keypress]) -> None:
+        """Disarm the partition and wait for the panel to confirm."""
+        await self.async_submit(
+            "disarm",
+            ("disarm", tuple(code)),
+            [self._callback_id],
+            lambda: self._arming_level() in DisarmArmingLevels,
+            lambda: self._server.disarm(code=code, partition=self.partition_number),
+        )
+
+    async def async_bypass(
+        self, code: list[Keypress], zone_numbers: list[int]
+    ) -> dict[int, bool]:
+        """Bypass zones with one keypress sequence and return which took effect.
+
+        The direct bypass sequence is # and the user code once, followed by
+        the two-digit number and # for every zone, so the code is validated
+        a single time for the whole batch. `Concord4CommandTimeout` is raised
+        if no zone was bypassed in time.
+        """
+        zone_numbers = sorted(set(zone_numbers))
+        keys: list[Keypress] = ["#", *code]
+        for zone_number in zone_numbers:
+            keys.extend([*code_digits(zone_number), "#"])
+
+        try:
+            await self.async_submit(
+                "bypass",
+                ("bypass", tuple(code), tuple(zone_numbers)),
+                [f"p{self.partition_number}-z{zone}" for zone in zone_numbers],
+                lambda: all(self._bypassed(zone) for zone in zone_numbers),
+                lambda: self._server.send(
+                    CommandSendableMessage(
+                        data=ConcordKeypressCommand(
+                            params=(self.partition_number, keys)
+                        )
+                    )
+                ),
+            )
+        except Concord4CommandTimeout:
+            # a batch that bypassed nothing failed, a partial one is reported
+            if not any(self._bypassed(zone) for zone in zone_numbers):
+                raise
+
+            LOGGER.warning(
+                "Partition %s did not bypass every zone of %s",
+                self.partition_number,
+                zone_numbers,
+            )
+
+        return {zone: self._bypassed(zone) for zone in zone_numbers}
+
+    def _arming_level(self) -> str | None:
+        """Return the arming level reported for the partition."""
+        partition = self._server.state.partitions.get(self.partition_number)
+        return None if partition is None else partition.arming_level
+
+    def _bypassed(self, zone_number: int) -> bool:
+        """Return True if the panel reports the zone as bypassed."""
+        zone = self._server.state.zones.get(f"p{self.partition_number}-z{zone_number}")
+        return zone is not None and zone.zone_status == "bypassed"
+
+    async def async_submit(
+        self,
+        name: str,
+        key: tuple,
+        callback_ids: list[str],
+        is_confirmed: Callable[[], bool] | None,
+        send: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Queue a command, collapsing it into an identical waiting one.
+
+        `is_confirmed` is checked whenever one of `callback_ids` changes. With
+        `is_confirmed` set to None the command is done once it was sent.
+        """
+        if (waiting := self._waiting.get(key)) is not None:
+            self.collapsed += 1
+            LOGGER.debug(
+                "collapsed duplicate %s on partition %s", name, self.partition_number
+            )
+            await asyncio.shield(waiting)
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiting[key] = future
+
+        try:
+            async with self._lock:
+                # identical commands arriving from now on run after this one
+                self._release(key, future)
+                await self._async_run(name, callback_ids, is_confirmed, send)
+        except asyncio.CancelledError:
+            self._release(key, future)
+            future.cancel()
+            raise
+        except Exception as err:
+            self._release(key, future)
+            future.set_exception(err)
+            future.exception()
+            raise
+
+        future.set_result(None)
+
+    def _release(self, key: tuple, future: asyncio.Future[None]) -> None:
+        """Stop collapsing into `future`, unless a newer command took its key."""
+        if self._waiting.get(key) is future:
+            del self._waiting[key]
+
+    async def _async_run(
+        self,
+        name: str,
+        callback_ids: list[str],
+        is_confirmed: Callable[[], bool] | None,
+        send: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Send a command and wait for the panel state to confirm it."""
+        confirmed = asyncio.Event()
+
+        @callback
+        def handle_update() -> None:
+            if is_confirmed():
+                confirmed.set()
+
+        started = time.monotonic()
+
+        if is_confirmed is not None:
+            for callback_id in callback_ids:
+                self._server.register_callback(callback_id, handle_update)
+
+        try:
+            try:
+                await send()
+            except Exception:
+                self.failed += 1
+                self._record(name, "failed", started)
+                raise
+
+            self.sent += 1
+            if is_confirmed is None:
+                self._record(name, "sent", started)
+                return
+
+            handle_update()
+            async with asyncio.timeout(COMMAND_TIMEOUT):
+                await confirmed.wait()
+        except TimeoutError as err:
+            self.timed_out += 1
+            self._record(name, "timed_out", started)
+            raise Concord4CommandTimeout(
+                f"Partition {self.partition_number} did not confirm {name} "
+                f"within {COMMAND_TIMEOUT}s"
+            ) from err
+        finally:
+            if is_confirmed is not None:
+                for callback_id in callback_ids:
+                    self._server.remove_callback(callback_id, handle_update)
+
+        self.confirmed += 1
+        self._metrics.async_record_command(name, time.monotonic() - started)
+        self._record(name, "confirmed", started)
+
+    def _record(self, name: str, result: str, started: float) -> None:
+        """Add the outcome of a command to the event log."""
+        if self._events is None:
+            return
+
+        self._events.async_record(
+            "command",
+            {
+                "partition": self.partition_number,
+                "command": name,
+                "result": result,
+                "ms": round((time.monotonic() - started) * 1000),
+            },
+        )
+
+
+def code_digits(number: int) -> list[Keypress]:
+    """Return the two keypresses entering a zone number."""
+    return code_to_keypresses(f"{number:02d}")
+
+
+class Concord4CommandTimeout(HomeAssistantError):
+    """Error to indicate the panel did not confirm a command."""
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -9,15 +10,44 @@ from concord4ws import Concord4WSClient
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DEVICE
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN
+from .classification import ZONE_SENSOR_TYPES, Concord4ZoneClassifier
+from .const import (
+    CONF_COMPACT_RECORDING,
+    CONF_DISPATCH_WINDOW,
+    CONF_OPTIMISTIC,
+    CONF_TRANSPORT,
+    CONF_ZONE_BINARY_SENSORS,
+    CONF_ZONE_TYPES,
+    DEFAULT_DISPATCH_WINDOW,
+    DOMAIN,
+    TRANSPORT_SERIAL,
+    TRANSPORT_WEBSOCKET,
+)
+from .discovery import (
+    MAX_PROBE_TARGETS,
+    DiscoveredServer,
+    async_discover,
+    async_probe,
+    subnet_hosts,
+)
+from .serial_transport import async_probe_serial
 
 _LOGGER = logging.getLogger(__name__)
 
+# a manually entered server is accepted once it connects, the probe for its
+# serial waits longer than the discovery probes
+MANUAL_PROBE_TIMEOUT = 30
+
+CONF_ZONE = "zone"
+CONF_SENSOR_TYPE = "sensor_type"
+SENSOR_TYPE_AUTO = "auto"
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required("name"): str,
@@ -26,6 +56,31 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_SERIAL_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): str,
+        vol.Required(CONF_DEVICE, default="/dev/ttyUSB0"): str,
+    }
+)
+
+# entry data locating the panel on each transport
+TRANSPORT_KEYS = {
+    TRANSPORT_WEBSOCKET: ("host", "port"),
+    TRANSPORT_SERIAL: (CONF_DEVICE,),
+}
+
+CONF_SUBNET = "subnet"
+CONF_PORT_START = "port_start"
+CONF_PORT_END = "port_end"
+
+STEP_DISCOVERY_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SUBNET, default="192.168.1.0/24"): str,
+        vol.Required(CONF_PORT_START, default=8080): cv.port,
+        vol.Required(CONF_PORT_END, default=8080): cv.port,
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
@@ -37,7 +92,25 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     except Exception as err:
         raise CannotConnect from err
 
-    return {"name": data["name"]}
+    # the serial is only the unique ID, a server slow to send it is still added
+    server = await async_probe(data["host"], data["port"], MANUAL_PROBE_TIMEOUT)
+
+    return {
+        "name": data["name"],
+        "serial_number": None if server is None else server.serial_number,
+    }
+
+
+async def validate_serial_input(
+    hass: HomeAssistant, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate a panel answers on the automation module port."""
+
+    serial_number = await async_probe_serial(data[CONF_DEVICE])
+    if serial_number is None:
+        raise CannotConnect
+
+    return {"name": data["name"], "serial_number": serial_number}
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -46,10 +119,26 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, DiscoveredServer] = {}
+        self._discovery_input: dict[str, Any] | None = None
+        self._discovery_targets: tuple[list[str], range] | None = None
+        self._discovery_task: asyncio.Task[list[DiscoveredServer]] | None = None
+        self._discovery_error: str | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["discovery", "manual", "serial"]
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a manually entered server."""
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
@@ -60,60 +149,282 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                return self.async_create_entry(title=info["name"], data=user_input)
+                return await self._async_create_entry(
+                    info["name"], info["serial_number"], user_input
+                )
+
+        return self.async_show_form(
+            step_id="manual", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a panel wired to the automation module serial port."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                info = await validate_serial_input(self.hass, user_input)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                return await self._async_create_entry(
+                    info["name"],
+                    info["serial_number"],
+                    {**user_input, CONF_TRANSPORT: TRANSPORT_SERIAL},
+                )
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="serial", data_schema=STEP_SERIAL_DATA_SCHEMA, errors=errors
         )
 
-    # @staticmethod
-    # @callback
-    # def async_get_options_flow(
-    #     config_entry: config_entries.ConfigEntry,
-    # ) -> config_entries.OptionsFlow:
-    #     """Create the options flow."""
-    #     return Concord4OptionsFlowHandler(config_entry)
+    async def async_step_discovery(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for a subnet and port range to probe for servers."""
+        errors: dict[str, str] = {}
+        if self._discovery_error is not None:
+            errors["base"] = self._discovery_error
+            self._discovery_error = None
+            user_input, self._discovery_input = self._discovery_input, None
+        elif user_input is not None:
+            ports = range(user_input[CONF_PORT_START], user_input[CONF_PORT_END] + 1)
+            try:
+                hosts = subnet_hosts(user_input[CONF_SUBNET])
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                if not ports:
+                    errors[CONF_PORT_END] = "invalid_port_range"
+                elif len(hosts) * len(ports) > MAX_PROBE_TARGETS:
+                    errors["base"] = "too_many_targets"
+                else:
+                    self._discovery_input = user_input
+                    self._discovery_targets = (hosts, ports)
+                    return await self.async_step_probe()
+
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_DISCOVERY_DATA_SCHEMA, user_input
+            ),
+            errors=errors,
+            description_placeholders={"max_targets": str(MAX_PROBE_TARGETS)},
+        )
+
+    async def async_step_probe(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Probe the discovery targets in the background, showing progress."""
+        assert self._discovery_targets is not None
+        hosts, ports = self._discovery_targets
+
+        if self._discovery_task is None:
+            self._discovery_task = self.hass.async_create_task(
+                async_discover(hosts, ports), "concord4ws discovery"
+            )
+
+        if not self._discovery_task.done():
+            return self.async_show_progress(
+                step_id="probe",
+                progress_action="probe",
+                progress_task=self._discovery_task,
+                description_placeholders={"targets": str(len(hosts) * len(ports))},
+            )
+
+        task, self._discovery_task = self._discovery_task, None
+        try:
+            servers = task.result()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            self._discovery_error = "unknown"
+            return self.async_show_progress_done(next_step_id="discovery")
+
+        configured = {
+            (entry.data.get("host"), entry.data.get("port"))
+            for entry in self._async_current_entries()
+        }
+        self._discovered = {
+            f"{server.host}:{server.port}": server
+            for server in servers
+            if (server.host, server.port) not in configured
+        }
+        if self._discovered:
+            self._discovery_input = None
+            return self.async_show_progress_done(next_step_id="pick")
+
+        self._discovery_error = "no_servers_found"
+        return self.async_show_progress_done(next_step_id="discovery")
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop probing when the flow is closed."""
+        if self._discovery_task is not None:
+            self._discovery_task.cancel()
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick one of the discovered servers."""
+        if user_input is not None:
+            server = self._discovered[user_input["server"]]
+            return await self._async_create_entry(
+                user_input["name"],
+                server.serial_number,
+                {"name": user_input["name"], "host": server.host, "port": server.port},
+            )
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required("server"): vol.In(
+                        {
+                            address: f"{address} ({server.serial_number or 'unknown'})"
+                            for address, server in self._discovered.items()
+                        }
+                    ),
+                    vol.Required("name"): str,
+                }
+            ),
+        )
+
+    async def _async_create_entry(
+        self, name: str, serial_number: str | None, data: dict[str, Any]
+    ) -> FlowResult:
+        """Create the entry, aborting if the panel is already configured."""
+        if serial_number is not None:
+            await self.async_set_unique_id(serial_number)
+            self._abort_if_unique_id_configured(
+                updates=self._connection_updates(serial_number, data)
+            )
+
+        return self.async_create_entry(title=name, data=data)
+
+    @callback
+    def _connection_updates(
+        self, serial_number: str, data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Return the new address of a configured panel on the same transport.
+
+        A panel added again through another transport leaves its entry as is.
+        """
+        entry = self.hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, serial_number
+        )
+        transport = data.get(CONF_TRANSPORT, TRANSPORT_WEBSOCKET)
+        if (
+            entry is None
+            or entry.data.get(CONF_TRANSPORT, TRANSPORT_WEBSOCKET) != transport
+        ):
+            return None
+
+        return {key: data[key] for key in TRANSPORT_KEYS[transport]}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Create the options flow."""
+        return Concord4OptionsFlowHandler()
 
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
 
-# STEP_INIT_CONFIG_SCHEMA = vol.Schema(
-#     {
-#         vol.Required("default_arm_stay_mode", default="normal"): SelectSelector(
-#             SelectSelectorConfig(
-#                 options=["normal", "instant", "silent"],
-#                 mode=SelectSelectorMode.LIST,
-#                 translation_key="default_arm_stay_mode",
-#             )
-#         ),
-#         vol.Required("default_arm_away_mode", default="normal"): SelectSelector(
-#             SelectSelectorConfig(
-#                 options=["normal", "instant", "silent"],
-#                 mode=SelectSelectorMode.LIST,
-#                 translation_key="default_arm_away_mode",
-#             )
-#         ),
-#     }
-# )
-
-
-# class Concord4OptionsFlowHandler(config_entries.OptionsFlow):
-#     """Handle Concord4 options."""
-
-#     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
-#         """Initialize options flow."""
-#         self.config_entry = config_entry
-
-#     async def async_step_init(
-#         self, user_input: dict[str, Any] | None = None
-#     ) -> FlowResult:
-#         """Manage the options."""
-#         if user_input is not None:
-#             return self.async_create_entry(title="", data=user_input)
-
-#         return self.async_show_form(
-#             step_id="init",
-#             data_schema=STEP_INIT_CONFIG_SCHEMA,
-#         )
+class Concord4OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Concord4 options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choose which options to manage."""
+        return self.async_show_menu(step_id="init", menu_options=["settings", "zones"])
+
+    async def async_step_zones(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Override the sensor type of a zone, applied without a reload."""
+        if (
+            data := self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        ) is None:
+            return self.async_abort(reason="not_loaded")
+
+        zone_types: dict[str, str] = dict(
+            self.config_entry.options.get(CONF_ZONE_TYPES, {})
+        )
+
+        if user_input is not None:
+            if user_input[CONF_SENSOR_TYPE] == SENSOR_TYPE_AUTO:
+                zone_types.pop(user_input[CONF_ZONE], None)
+            else:
+                zone_types[user_input[CONF_ZONE]] = user_input[CONF_SENSOR_TYPE]
+
+            return self.async_create_entry(
+                title="",
+                data={**self.config_entry.options, CONF_ZONE_TYPES: zone_types},
+            )
+
+        classifier: Concord4ZoneClassifier = data["classifier"]
+        zones = {
+            zone_id: f"{name} ({sensor_type}, override)"
+            if zone_id in zone_types
+            else f"{name} ({sensor_type})"
+            for zone_id, (name, sensor_type) in sorted(
+                classifier.zones.items(), key=lambda item: item[1][0]
+            )
+        }
+
+        return self.async_show_form(
+            step_id="zones",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ZONE): vol.In(zones),
+                    vol.Required(CONF_SENSOR_TYPE, default=SENSOR_TYPE_AUTO): vol.In(
+                        [SENSOR_TYPE_AUTO, *ZONE_SENSOR_TYPES]
+                    ),
+                }
+            ),
+        )
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options that take effect on a reload."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_DISPATCH_WINDOW,
+                        default=options.get(
+                            CONF_DISPATCH_WINDOW, DEFAULT_DISPATCH_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Required(
+                        CONF_COMPACT_RECORDING,
+                        default=options.get(CONF_COMPACT_RECORDING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_ZONE_BINARY_SENSORS,
+                        default=options.get(CONF_ZONE_BINARY_SENSORS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_OPTIMISTIC,
+                        default=options.get(CONF_OPTIMISTIC, False),
+                    ): bool,
+                }
+            ),
+        )
@@ -0,0 +1,383 @@
+"""Connection handling for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+import random
+import time
+from typing import Any, Protocol
+
+from concord4ws import Concord4WSClient
+from concord4ws.types import State
+import websockets
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import LOGGER
+from .manager import Concord4ConnectionManager
+from .metrics import Concord4Metrics
+
+FrameListener = Callable[[Any, float], None]
+
+
+class Transport(Protocol):
+    """Link to the panel the client sends its commands through."""
+
+    async def send(self, message: str) -> None:
+        """Send a JSON command message."""
+
+    async def ping(self) -> Awaitable[Any]:
+        """Send a ping, returning an awaitable that completes on its reply."""
+
+    async def close(self) -> None:
+        """Close the link."""
+
+
+RECONNECT_BACKOFF_MIN = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+OPEN_TIMEOUT = 10
+CLOSE_TIMEOUT = 2
+
+# the link is pinged every interval and dropped once silent for STALE_AFTER
+HEARTBEAT_INTERVAL = 30
+HEARTBEAT_TIMEOUT = 10
+STALE_AFTER = 90
+
+
+class Concord4Connection:
+    """Own the websocket of a Concord4WSClient and supervise reconnects.
+
+    The client decodes frames and keeps the panel state, but its own connection
+    loop can neither be stopped nor backs off, so the websocket is driven here
+    instead. Every received frame is timestamped as it is read, then queued on
+    the domain-wide connection manager, whose dispatch loop hands it back to
+    `handle_frame` for the client to decode. A full state frame after a
+    reconnect is diffed against the previous state so only zones and partitions
+    that changed fire their callbacks.
+
+    Availability is pushed to listeners: it turns on once the server has sent
+    its state after (re)connecting, and off as soon as the websocket drops. A
+    half-open link can look connected while delivering nothing, so the link is
+    also pinged by a heartbeat and reconnected once neither frames nor ping
+    replies arrived for `STALE_AFTER` seconds.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        manager: Concord4ConnectionManager,
+        server: Concord4WSClient,
+        metrics: Concord4Metrics,
+    ) -> None:
+        """Initialize the connection."""
+        self._hass = hass
+        self._manager = manager
+        self.server = server
+        self.metrics = metrics
+
+        # the client keeps its callbacks in a class attribute shared by every
+        # instance, which would cross-fire callbacks between panels
+        self.server._callbacks = {}  # noqa: SLF001
+
+        self.ready = False
+        self.available = False
+        self.frame_received_at: float | None = None
+        self.reconnects = 0
+        self.stale_reconnects = 0
+        self.last_error: str | None = None
+        self.last_seen_at: float | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._frame_listeners: list[FrameListener] = []
+        self._topology_listeners: list[Callable[[], None]] = []
+        self._topology_key: tuple[int, int, int] | None = None
+        self._ready_event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._transport: Transport | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._stale = False
+        self._stopping = False
+
+    @property
+    def uri(self) -> str:
+        """Return the websocket URI of the server."""
+        return f"ws://{self.server.host}:{self.server.port}"
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for availability changes."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_add_frame_listener(self, listener: FrameListener) -> CALLBACK_TYPE:
+        """Listen for raw websocket frames and their receive time."""
+        self._frame_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._frame_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_add_topology_listener(
+        self, listener: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for zones or partitions being added or removed."""
+        self._topology_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._topology_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Start the supervised connection loop."""
+        if self._task is None:
+            self._manager.async_register(self)
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"concord4ws connection {self.uri}"
+            )
+
+    async def async_connect(self, timeout: float | None = None) -> None:
+        """Connect to the server and wait for the first panel state.
+
+        Raises TimeoutError if the state did not arrive in time; the connection
+        keeps retrying in the background until stopped.
+        """
+        self.async_start()
+
+        async with asyncio.timeout(timeout):
+            await self._ready_event.wait()
+
+    async def async_stop(self) -> None:
+        """Stop the connection loop and close the websocket."""
+        if self._task is not None:
+            self._stopping = True
+            if self._transport is not None:
+                await self._transport.close()
+
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            self._stopping = False
+            self._manager.async_unregister(self)
+
+    async def async_release(self) -> None:
+        """Stop, then drop whatever is still registered on the connection.
+
+        Meant to run after every other teardown of the config entry, when
+        nothing should be left: remaining client callbacks and listeners
+        would keep entities and the client alive across reloads, so they are
+        counted as leaked, logged and cleared.
+        """
+        await self.async_stop()
+
+        callbacks = self.server._callbacks  # noqa: SLF001
+        leaked = sum(len(registered) for registered in callbacks.values())
+        leaked += len(self._listeners)
+        leaked += len(self._frame_listeners)
+        leaked += len(self._topology_listeners)
+        if leaked:
+            LOGGER.warning(
+                "%s callbacks and listeners were left registered on %s",
+                leaked,
+                self.uri,
+            )
+
+        callbacks.clear()
+        self._listeners.clear()
+        self._frame_listeners.clear()
+        self._topology_listeners.clear()
+        self.server._ws = None  # noqa: SLF001
+        self._manager.async_record_release(leaked)
+
+    async def _async_run(self) -> None:
+        """Keep the panel connected, backing off with jitter between attempts."""
+        attempt = 0
+
+        while True:
+            try:
+                await self._async_session()
+                self.last_error = "connection closed by server"
+            except (OSError, TimeoutError, websockets.WebSocketException) as err:
+                self.last_error = repr(err)
+            finally:
+                if self._heartbeat is not None:
+                    self._heartbeat.cancel()
+                    self._heartbeat = None
+                if self._stale:
+                    self._stale = False
+                    self.last_error = (
+                        f"no frames or heartbeat replies for {STALE_AFTER}s"
+                    )
+                if self._transport is not None:
+                    attempt = 0
+                self._transport = None
+                self.server._connected = False  # noqa: SLF001
+                self._set_available(False)
+
+            if self._stopping:
+                return
+
+            delay = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_MIN * 2**attempt)
+            delay *= random.uniform(0.5, 1)
+            attempt += 1
+            self.reconnects += 1
+
+            LOGGER.warning(
+                "lost connection to concord4ws server at %s (%s), retrying in %.1fs",
+                self.uri,
+                self.last_error,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    async def _async_session(self) -> None:
+        """Connect once and queue received frames until the link drops."""
+        async with self._manager.connect_limiter:
+            websocket = await websockets.connect(
+                self.uri, open_timeout=OPEN_TIMEOUT, close_timeout=CLOSE_TIMEOUT
+            )
+
+        async with websocket:
+            self._set_transport(websocket)
+
+            async for message in websocket:
+                self._manager.async_enqueue(self, message, time.monotonic())
+
+    def _set_transport(self, transport: Transport) -> None:
+        """Route client commands through a freshly opened link."""
+        LOGGER.info("connected to concord4ws panel at %s", self.uri)
+        self._transport = transport
+        self.server._ws = transport  # noqa: SLF001
+        self.server._connected = True  # noqa: SLF001
+        self.last_seen_at = time.monotonic()
+        self._heartbeat = self._hass.async_create_background_task(
+            self._async_heartbeat(transport), f"concord4ws heartbeat {self.uri}"
+        )
+
+    async def _async_heartbeat(self, transport: Transport) -> None:
+        """Ping the link and close it once it went silent."""
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+            sent_at = time.monotonic()
+            try:
+                async with asyncio.timeout(HEARTBEAT_TIMEOUT):
+                    await (await transport.ping())
+            except (OSError, TimeoutError, websockets.WebSocketException) as err:
+                LOGGER.debug("no heartbeat reply from %s: %r", self.uri, err)
+            else:
+                self.last_seen_at = time.monotonic()
+                self.metrics.async_record_heartbeat(self.last_seen_at - sent_at)
+
+            if time.monotonic() - self.last_seen_at >= STALE_AFTER:
+                LOGGER.warning(
+                    "concord4ws server at %s went silent, reconnecting", self.uri
+                )
+                self.stale_reconnects += 1
+                self._stale = True
+                self._set_available(False)
+                await transport.close()
+                return
+
+    def handle_frame(self, message: Any, received_at: float) -> None:
+        """Let the client handle a frame read at `received_at`."""
+        self.frame_received_at = received_at
+        self.last_seen_at = received_at
+        cpu_start = time.process_time()
+        self.metrics.async_record_frame(message, received_at)
+
+        for listener in self._frame_listeners:
+            listener(message, received_at)
+
+        previous: State | None = getattr(self.server, "_state", None)
+
+        try:
+            self.server._handle_message(message)  # noqa: SLF001
+
+            if (state := getattr(self.server, "_state", None)) is not previous:
+                # reconcile entities first, so that zones and partitions gone
+                # from the panel retire before availability is pushed out
+                self._check_topology(force=True)
+                self._handle_state(previous, state)
+            elif state is not None:
+                self._check_topology()
+        finally:
+            self.frame_received_at = None
+            self.metrics.async_record_cpu(time.process_time() - cpu_start)
+
+    def _check_topology(self, force: bool = False) -> None:
+        """Notify topology listeners if zones or partitions were added.
+
+        Zone and partition data messages only ever add or replace entries, which
+        a change in counts reveals without diffing; a full state may also drop
+        entries, so it always notifies.
+        """
+        state = self.server.state
+        key = (
+            len(state.zones),
+            len(state.partitions),
+            sum(len(partition.zones) for partition in state.partitions.values()),
+        )
+        if key == self._topology_key and not force:
+            return
+
+        self._topology_key = key
+        for listener in list(self._topology_listeners):
+            listener()
+
+    def _set_available(self, available: bool) -> None:
+        """Update availability and notify listeners if it changed."""
+        if available == self.available:
+            return
+
+        self.available = available
+        LOGGER.debug(
+            "panel %s, notifying %s entities",
+            "available" if available else "unavailable",
+            len(self._listeners),
+        )
+
+        for listener in list(self._listeners):
+            listener()
+
+    def _handle_state(self, previous: State | None, state: State) -> None:
+        """Reconcile entities with a full panel state."""
+        if not self.ready:
+            self.ready = True
+            self._ready_event.set()
+            self._set_available(True)
+            return
+
+        if previous is None:
+            return
+
+        changed = [
+            zone.callback_id()
+            for zone_id, zone in state.zones.items()
+            if previous.zones.get(zone_id) != zone
+        ] + [
+            partition.callback_id()
+            for number, partition in state.partitions.items()
+            if previous.partitions.get(number) != partition
+        ]
+        LOGGER.debug("resynced panel state, %s zones/partitions changed", len(changed))
+
+        callbacks = self.server._callbacks  # noqa: SLF001
+        for callback_id in changed:
+            for state_callback in list(callbacks.get(callback_id, ())):
+                state_callback()
+
+        self._set_available(True)
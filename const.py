@@ -5,15 +5,24 @@ import logging
 import voluptuous as vol
 
 from homeassistant.const import ATTR_CODE
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import VolDictType
 
 DOMAIN = "concord4ws"
 
+# levels are left to the logger integration, both loggers are in the manifest
 LOGGER = logging.getLogger("concord4ws-ha")
-LOGGER.setLevel(logging.DEBUG)
 
-LIB_LOGGER = logging.getLogger("concord4ws")
-LIB_LOGGER.setLevel(logging.DEBUG)
+CONF_TRANSPORT = "transport"
+TRANSPORT_WEBSOCKET = "websocket"
+TRANSPORT_SERIAL = "serial"
+
+CONF_DISPATCH_WINDOW = "dispatch_window"
+DEFAULT_DISPATCH_WINDOW = 20
+CONF_COMPACT_RECORDING = "compact_recording"
+CONF_ZONE_BINARY_SENSORS = "zone_binary_sensors"
+CONF_OPTIMISTIC = "optimistic"
+CONF_ZONE_TYPES = "zone_types"
 
 
 def alarm_panel_identifier(serial_number: str, partition_number: int) -> str:
@@ -21,11 +30,27 @@ def alarm_panel_identifier(serial_number: str, partition_number: int) -> str:
     return f"{serial_number}_p{partition_number}"
 
 
+def parse_alarm_panel_identifier(identifier: str) -> tuple[str, int]:
+    """Return the serial number and partition number of a partition identifier."""
+    serial_number, _, partition_number = identifier.rpartition("_p")
+    return serial_number, int(partition_number)
+
+
 def alarm_panel_uid(serial_number: str, partition_number: int) -> str:
     """Generate a unique identifier for a partition."""
     return f"{serial_number}_p{partition_number}_alarm_panel"
 
 
+# kept a string, leading zeros are part of the code
 USER_CODE_SERVICE_SCHEMA: VolDictType = {
-    vol.Required(ATTR_CODE): vol.All(vol.Coerce(int), vol.Range(0, 9999))
+    vol.Required(ATTR_CODE): vol.All(cv.string, cv.matches_regex(r"^\d{4,6}$"))
+}
+
+ATTR_ZONES = "zones"
+
+BYPASS_ZONES_SERVICE_SCHEMA: VolDictType = {
+    **USER_CODE_SERVICE_SCHEMA,
+    vol.Required(ATTR_ZONES): vol.All(
+        cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(1, 96))], vol.Length(min=1)
+    ),
 }
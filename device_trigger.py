@@ -0,0 +1,145 @@
+"""Device triggers for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.device_automation.exceptions import (
+    InvalidDeviceAutomationConfig,
+)
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_ENTITY_ID,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DOMAIN, parse_alarm_panel_identifier
+from .triggers import PARTITION_TRIGGER_TYPES, ZONE_TRIGGER_TYPES, async_get_trigger_hub
+
+# unique id of the zone sensor, the entity zone triggers are attached to
+ZONE_UNIQUE_ID = re.compile(r"_(p\d+-z\d+)_zone_status$")
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(ZONE_TRIGGER_TYPES + PARTITION_TRIGGER_TYPES),
+        vol.Optional(CONF_ENTITY_ID): cv.entity_id_or_uuid,
+    }
+)
+
+
+def _partition(hass: HomeAssistant, device_id: str) -> tuple[str, int] | None:
+    """Return the panel serial and partition number of a device."""
+    if (device := dr.async_get(hass).async_get(device_id)) is None:
+        return None
+
+    for domain, identifier in device.identifiers:
+        if domain == DOMAIN:
+            return parse_alarm_panel_identifier(identifier)
+
+    return None
+
+
+def _zone_id(hass: HomeAssistant, entity_id: str) -> str | None:
+    """Return the zone of a zone sensor entity, by entity id or registry id."""
+    registry = er.async_get(hass)
+    try:
+        entity_id = er.async_validate_entity_id(registry, entity_id)
+    except vol.Invalid:
+        return None
+
+    if (entry := registry.async_get(entity_id)) is None or entry.platform != DOMAIN:
+        return None
+    if (match := ZONE_UNIQUE_ID.search(entry.unique_id)) is None:
+        return None
+
+    return match.group(1)
+
+
+async def async_validate_trigger_config(
+    hass: HomeAssistant, config: ConfigType
+) -> ConfigType:
+    """Validate a trigger config."""
+    config = TRIGGER_SCHEMA(config)
+
+    if config[CONF_TYPE] in ZONE_TRIGGER_TYPES and CONF_ENTITY_ID not in config:
+        raise InvalidDeviceAutomationConfig(
+            f"Zone trigger {config[CONF_TYPE]} needs a zone entity"
+        )
+    if config[CONF_TYPE] in PARTITION_TRIGGER_TYPES and CONF_ENTITY_ID in config:
+        raise InvalidDeviceAutomationConfig(
+            f"Partition trigger {config[CONF_TYPE]} takes no entity"
+        )
+
+    return config
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    """List the partition triggers of a device and the triggers of its zones."""
+    if _partition(hass, device_id) is None:
+        return []
+
+    base = {CONF_PLATFORM: "device", CONF_DOMAIN: DOMAIN, CONF_DEVICE_ID: device_id}
+    triggers = [{**base, CONF_TYPE: type_} for type_ in PARTITION_TRIGGER_TYPES]
+
+    registry = er.async_get(hass)
+    for entry in er.async_entries_for_device(registry, device_id):
+        if entry.platform == DOMAIN and ZONE_UNIQUE_ID.search(entry.unique_id):
+            triggers.extend(
+                {**base, CONF_ENTITY_ID: entry.id, CONF_TYPE: type_}
+                for type_ in ZONE_TRIGGER_TYPES
+            )
+
+    return triggers
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger to the zone or partition callbacks."""
+    if (partition := _partition(hass, config[CONF_DEVICE_ID])) is None:
+        raise InvalidDeviceAutomationConfig(
+            f"Device {config[CONF_DEVICE_ID]} is not a Concord4 partition"
+        )
+
+    serial_number, partition_number = partition
+    callback_id = f"p{partition_number}"
+    if CONF_ENTITY_ID in config:
+        if (zone_id := _zone_id(hass, config[CONF_ENTITY_ID])) is None:
+            raise InvalidDeviceAutomationConfig(
+                f"Entity {config[CONF_ENTITY_ID]} is not a Concord4 zone"
+            )
+        callback_id = zone_id
+
+    job = HassJob(action, f"concord4ws device trigger {config[CONF_TYPE]}")
+    payload = {
+        **trigger_info["trigger_data"],
+        **config,
+        "description": f"{callback_id} {config[CONF_TYPE]}",
+    }
+
+    @callback
+    def handle_trigger() -> None:
+        hass.async_run_hass_job(job, {"trigger": payload})
+
+    return async_get_trigger_hub(hass).async_add_listener(
+        serial_number, callback_id, config[CONF_TYPE], handle_trigger
+    )
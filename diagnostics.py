@@ -0,0 +1,119 @@
+"""Diagnostics support for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+import sys
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE, CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+
+from .const import DOMAIN
+from .manager import DATA_MANAGER
+from .triggers import async_get_trigger_hub
+
+TO_REDACT = {CONF_HOST, CONF_DEVICE}
+
+
+def _redact_text(text: str | None, entry: ConfigEntry) -> str | None:
+    """Replace the redacted entry values where they appear in a message."""
+    if text is None:
+        return None
+
+    for key in TO_REDACT:
+        if value := entry.data.get(key):
+            text = text.replace(str(value), REDACTED)
+
+    return text
+
+
+def _object_size(value: Any) -> int:
+    """Return the bytes of an object and of its attribute dict or slots."""
+    size = sys.getsizeof(value)
+    if hasattr(value, "__dict__"):
+        size += sys.getsizeof(value.__dict__)
+    for name in getattr(type(value), "__slots__", ()):
+        size += sys.getsizeof(getattr(value, name, None))
+
+    return size
+
+
+def _entity_size(entity: Entity, shared: set[int]) -> int:
+    """Estimate the bytes held by an entity, excluding objects shared by the entry."""
+    size = sys.getsizeof(entity) + sys.getsizeof(entity.__dict__)
+
+    for value in entity.__dict__.values():
+        if id(value) in shared or isinstance(value, Entity):
+            continue
+
+        size += _object_size(value)
+
+    return size
+
+
+def _entity_memory(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+    """Return the estimated memory per entity, grouped by entity class.
+
+    Objects referenced by more than one entity, like the shared entity
+    descriptions, are counted once in "shared_bytes" instead of per entity.
+    """
+    entities = data["dispatcher"].entities
+    shared = {id(hass), *(id(value) for value in data.values())}
+    references = Counter(
+        id(value) for entity in entities for value in entity.__dict__.values()
+    )
+    common = {
+        id(value): value
+        for entity in entities
+        for value in entity.__dict__.values()
+        if references[id(value)] > 1 and id(value) not in shared
+    }
+    shared.update(common)
+
+    sizes: dict[str, list[int]] = defaultdict(list)
+    for entity in entities:
+        sizes[type(entity).__name__].append(_entity_size(entity, shared))
+
+    return {
+        "entities": {
+            name: {"count": len(values), "bytes_per_entity": sum(values) // len(values)}
+            for name, values in sizes.items()
+        },
+        "total_bytes": sum(sum(values) for values in sizes.values()),
+        "shared_bytes": sum(_object_size(value) for value in common.values()),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": {
+            "connected": data["server"].connected,
+            "ready": data["connection"].ready,
+            "reconnects": data["connection"].reconnects,
+            "stale_reconnects": data["connection"].stale_reconnects,
+            "last_error": _redact_text(data["connection"].last_error, entry),
+        },
+        "dispatcher": data["dispatcher"].stats,
+        "metrics": data["metrics"].as_dict(),
+        "commands": {
+            partition_number: queue.stats
+            for partition_number, queue in data["commands"].items()
+        },
+        "events": {**data["events"].stats, "events": data["events"].as_list()},
+        "entity_memory": _entity_memory(hass, data),
+        "manager": hass.data[DATA_MANAGER].stats,
+        "triggers": async_get_trigger_hub(hass).stats,
+    }
@@ -0,0 +1,121 @@
+"""LAN discovery of Concord4WS servers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+import ipaddress
+import itertools
+import json
+
+import websockets
+
+from .const import LOGGER
+
+PROBE_TIMEOUT = 2
+PROBE_CLOSE_TIMEOUT = 1
+MAX_CONCURRENT_PROBES = 64
+MAX_PROBE_TARGETS = 4096
+
+
+@dataclass(frozen=True)
+class DiscoveredServer:
+    """A Concord4WS server that answered a probe."""
+
+    host: str
+    port: int
+    serial_number: str | None
+    panel_type: str | None
+
+
+def subnet_hosts(subnet: str) -> list[str]:
+    """Return the host addresses of a subnet, raising ValueError if invalid."""
+    network = ipaddress.ip_network(subnet, strict=False)
+    if network.num_addresses == 1:
+        return [str(network.network_address)]
+
+    return [str(host) for host in network.hosts()]
+
+
+async def async_probe(
+    host: str, port: int, timeout: float = PROBE_TIMEOUT
+) -> DiscoveredServer | None:
+    """Return the server at host and port, or None if none answered in time.
+
+    A Concord4WS server sends its full state right after the handshake, which
+    carries the panel serial. The probe connection is always closed.
+    """
+    try:
+        websocket = await websockets.connect(
+            f"ws://{host}:{port}",
+            open_timeout=timeout,
+            close_timeout=PROBE_CLOSE_TIMEOUT,
+            max_size=None,
+        )
+    except (OSError, TimeoutError, websockets.WebSocketException):
+        return None
+
+    try:
+        async with asyncio.timeout(timeout):
+            async for message in websocket:
+                if (server := _parse_state(host, port, message)) is not None:
+                    return server
+    except (TimeoutError, websockets.WebSocketException):
+        return None
+    finally:
+        await websocket.close()
+
+    return None
+
+
+async def async_discover(
+    hosts: Iterable[str],
+    ports: Iterable[int],
+    timeout: float = PROBE_TIMEOUT,
+    limit: int = MAX_CONCURRENT_PROBES,
+) -> list[DiscoveredServer]:
+    """Probe every host and port with at most `limit` probes in flight."""
+    targets = list(itertools.product(hosts, ports))
+    pending = iter(targets)
+    found: list[DiscoveredServer] = []
+
+    async def worker() -> None:
+        for host, port in pending:
+            try:
+                server = await async_probe(host, port, timeout)
+            except Exception:  # noqa: BLE001
+                # a misbehaving host must not end the scan of the others
+                LOGGER.debug("probe of %s:%s failed", host, port, exc_info=True)
+                continue
+
+            if server is not None:
+                found.append(server)
+
+    await asyncio.gather(*(worker() for _ in range(min(limit, len(targets)))))
+
+    LOGGER.debug("probed %s targets, found %s servers", len(targets), len(found))
+    return sorted(found, key=lambda server: (server.host, server.port))
+
+
+def _parse_state(host: str, port: int, message: str | bytes) -> DiscoveredServer | None:
+    """Return the server described by a state message, None for other frames."""
+    try:
+        frame = json.loads(message)
+    except ValueError:
+        return None
+
+    if not isinstance(frame, dict) or frame.get("type") != "state":
+        return None
+
+    if not isinstance(data := frame.get("data"), dict) or not isinstance(
+        panel := data.get("panel"), dict
+    ):
+        return None
+
+    return DiscoveredServer(
+        host=host,
+        port=port,
+        serial_number=panel.get("serialNumber"),
+        panel_type=panel.get("panelType"),
+    )
@@ -0,0 +1,204 @@
+"""Batched state writes for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+
+from .const import LOGGER
+from .metrics import Concord4Metrics
+
+# write priorities, lower is written first
+PRIORITY_PARTITION = 0
+PRIORITY_ZONE = 1
+PRIORITY_NAMES = ("partition", "zone")
+
+# zone writes per loop iteration, so partition writes can cut in between chunks
+ZONE_CHUNK = 32
+
+
+class Concord4Dispatcher:
+    """Collect dirty entities and write their state together.
+
+    Callbacks from the Concord4WS client only mark an entity as dirty.
+    Partition entities are written on the next loop iteration, ahead of any
+    zone write. The first dirty zone entity opens a window of `max_latency`
+    seconds, and every zone entity marked again before the window ends is
+    written once with its latest state. Due zone writes go out in chunks of
+    `ZONE_CHUNK`, each preceded by the partition writes pending by then, so a
+    burst of zone changes cannot hold back an arming or alarm change.
+
+    The receive time of the oldest frame behind a pending write is kept so the
+    latency recorded at flush time covers the whole coalescing window.
+    Immediate writes, such as availability changes, end the zone window early so
+    all entities of an entry update without waiting.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_latency: float, metrics: Concord4Metrics
+    ) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        self._max_latency = max_latency
+        self._metrics = metrics
+        # per priority: entity -> (oldest frame receive time, first schedule time)
+        self._pending: tuple[dict[Entity, tuple[float | None, float]], ...] = tuple(
+            {} for _ in PRIORITY_NAMES
+        )
+        self.entities: set[Entity] = set()
+        self._window_handle: asyncio.TimerHandle | None = None
+        self._flush_handle: asyncio.Handle | None = None
+        self._zones_due = False
+
+        self.updates = 0
+        self.suppressed = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.flushes = 0
+        self.max_pending = [0] * len(PRIORITY_NAMES)
+
+    @property
+    def stats(self) -> dict[str, int | float | dict[str, int]]:
+        """Return dispatcher counters."""
+        return {
+            "max_latency": self._max_latency,
+            "updates": self.updates,
+            "suppressed": self.suppressed,
+            "coalesced": self.coalesced,
+            "writes": self.writes,
+            "flushes": self.flushes,
+            "pending": {
+                name: len(pending)
+                for name, pending in zip(PRIORITY_NAMES, self._pending)
+            },
+            "max_pending": dict(zip(PRIORITY_NAMES, self.max_pending)),
+        }
+
+    @callback
+    def async_schedule(
+        self,
+        entity: Entity,
+        received_at: float | None = None,
+        immediate: bool = False,
+    ) -> None:
+        """Mark an entity as dirty, writing it on the next flush."""
+        self.updates += 1
+        priority = getattr(entity, "dispatch_priority", PRIORITY_ZONE)
+        pending = self._pending[priority]
+
+        if (queued := pending.get(entity)) is not None:
+            self.coalesced += 1
+            if queued[0] is None and received_at is not None:
+                pending[entity] = (received_at, queued[1])
+        else:
+            pending[entity] = (received_at, time.monotonic())
+            self.max_pending[priority] = max(self.max_pending[priority], len(pending))
+
+        if priority == PRIORITY_PARTITION:
+            self._async_flush_soon()
+        elif immediate or self._max_latency <= 0:
+            self._async_zones_due()
+        elif self._window_handle is None and not self._zones_due:
+            self._window_handle = self._hass.loop.call_later(
+                self._max_latency, self._async_zones_due
+            )
+
+    @callback
+    def async_register(self, entity: Entity) -> None:
+        """Track an entity added to HA."""
+        self.entities.add(entity)
+
+    @callback
+    def async_discard(self, entity: Entity) -> None:
+        """Forget an entity that is going away, dropping its pending write."""
+        self.entities.discard(entity)
+        for pending in self._pending:
+            pending.pop(entity, None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel any scheduled flush and drop pending writes."""
+        for handle in (self._window_handle, self._flush_handle):
+            if handle is not None:
+                handle.cancel()
+
+        self._window_handle = None
+        self._flush_handle = None
+        self._zones_due = False
+        for pending in self._pending:
+            pending.clear()
+
+    @callback
+    def _async_zones_due(self) -> None:
+        """End the zone window and write pending zone entities."""
+        if self._window_handle is not None:
+            self._window_handle.cancel()
+            self._window_handle = None
+
+        self._zones_due = True
+        self._async_flush_soon()
+
+    @callback
+    def _async_flush_soon(self) -> None:
+        """Flush on the next loop iteration."""
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write partition entities, then the next chunk of due zone entities."""
+        self._flush_handle = None
+        cpu_start = time.process_time()
+        self.flushes += 1
+
+        partitions = self._pending[PRIORITY_PARTITION]
+        batch = list(partitions.items())
+        partitions.clear()
+        written = self._async_write(PRIORITY_PARTITION, batch)
+
+        if self._zones_due:
+            zones = self._pending[PRIORITY_ZONE]
+            chunk = [
+                (entity, zones.pop(entity))
+                for entity in list(itertools.islice(zones, ZONE_CHUNK))
+            ]
+            written += self._async_write(PRIORITY_ZONE, chunk)
+
+            if zones:
+                self._async_flush_soon()
+            else:
+                self._zones_due = False
+
+        self._metrics.async_record_cpu(time.process_time() - cpu_start)
+        LOGGER.debug("flushed %s state writes", written)
+
+    def _async_write(
+        self,
+        priority: int,
+        pending: list[tuple[Entity, tuple[float | None, float]]],
+    ) -> int:
+        """Write entities of one priority, recording latency and wait time."""
+        now = time.monotonic()
+        written = 0
+
+        for entity, (received_at, scheduled_at) in pending:
+            if entity.hass is None:
+                continue
+
+            written += 1
+            entity.async_write_ha_state()
+            self._metrics.async_record_dispatch_wait(
+                PRIORITY_NAMES[priority], now - scheduled_at
+            )
+
+            if received_at is not None:
+                self._metrics.async_record_write(
+                    getattr(entity, "metric_kind", "other"), received_at
+                )
+
+        self.writes += written
+        return written
@@ -0,0 +1,214 @@
+"""Base entity for the Concord4 WebSocket integration."""
+
+from typing import Any
+
+from concord4ws.types import ZoneData
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+
+from .aggregates import Concord4PartitionIndex
+from .classification import SIGNAL_ZONE_TYPES_CHANGED, ZoneSensorType
+from .connection import Concord4Connection
+from .const import DOMAIN, LOGGER, alarm_panel_identifier
+from .dispatcher import PRIORITY_ZONE, Concord4Dispatcher
+from .topology import SIGNAL_TOPOLOGY_RETIRED
+
+
+class Concord4Entity(Entity):
+    """Base class for entities updated by Concord4WS callbacks."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    # message type used when recording receive-to-write latency
+    metric_kind: str
+    # dispatcher priority of state writes
+    dispatch_priority = PRIORITY_ZONE
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        callback_id: str,
+    ) -> None:
+        """Initialize the entity."""
+        self._connection = connection
+        self._server = connection.server
+        self._dispatcher = dispatcher
+        self._callback_id = callback_id
+        self._rendered: Any = None
+
+    @property
+    def available(self) -> bool:
+        """Return True if websocket server (and by extension the alarm panel) is available."""
+        return self._connection.available
+
+    async def async_added_to_hass(self):
+        """Run when this Entity has been added to HA."""
+        if self._connection.ready:
+            self._rendered = self._render()
+
+        self._dispatcher.async_register(self)
+        self.async_on_remove(
+            self._connection.async_add_listener(self._handle_availability)
+        )
+        self.async_on_remove(self._async_subscribe())
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_TOPOLOGY_RETIRED.format(self.platform.config_entry.entry_id),
+                self._handle_retired,
+            )
+        )
+
+    async def async_will_remove_from_hass(self):
+        """Entity being removed from hass."""
+        self._dispatcher.async_discard(self)
+
+    @callback
+    def _async_subscribe(self) -> CALLBACK_TYPE:
+        """Subscribe to updates of the entity's zone or partition."""
+        self._server.register_callback(self._callback_id, self._handle_update)
+
+        @callback
+        def unsubscribe() -> None:
+            self._server.remove_callback(self._callback_id, self._handle_update)
+
+        return unsubscribe
+
+    @callback
+    def _handle_update(self) -> None:
+        """Queue a state write if the rendered state changed."""
+        rendered = self._render()
+
+        if rendered == self._rendered:
+            self._dispatcher.suppressed += 1
+            return
+
+        self._rendered = rendered
+        self._dispatcher.async_schedule(self, self._connection.frame_received_at)
+
+    @callback
+    def _handle_availability(self) -> None:
+        """Write state right away when the connection comes or goes."""
+        if self._connection.available:
+            self._rendered = self._render()
+
+        self._dispatcher.async_schedule(self, immediate=True)
+
+    @callback
+    def _handle_retired(self, callback_ids: set[str]) -> None:
+        """Remove the entity once its zone or partition left the panel."""
+        if self._callback_id not in callback_ids:
+            return
+
+        LOGGER.info("retiring %s, %s left the panel", self.entity_id, self._callback_id)
+        if self.registry_entry is not None:
+            er.async_get(self.hass).async_remove(self.entity_id)
+        else:
+            self.hass.async_create_task(self.async_remove())
+
+    def _render(self) -> Any:
+        """Return the visible state, used to skip redundant writes."""
+        raise NotImplementedError
+
+
+class Concord4ZoneConfig:
+    """Static configuration of a zone entity, retyped in place."""
+
+    __slots__ = (
+        "panel_name",
+        "partition_number",
+        "sensor_name",
+        "sensor_type",
+        "zone_id",
+    )
+
+    sensor_type: ZoneSensorType
+
+    def __init__(
+        self,
+        panel_name: str,
+        sensor_name: str,
+        zone_id: str,
+        partition_number: int,
+        sensor_type: ZoneSensorType,
+    ):
+        self.panel_name = panel_name
+        self.sensor_name = sensor_name
+        self.zone_id = zone_id
+        self.partition_number = partition_number
+        self.sensor_type = sensor_type
+
+
+class Concord4ZoneEntity(Concord4Entity):
+    """Base class for zone entities, retyped in place when their type changes."""
+
+    metric_kind = "zone"
+    _config: Concord4ZoneConfig
+
+    async def async_added_to_hass(self):
+        """Run when this Entity has been added to HA."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_ZONE_TYPES_CHANGED.format(self.platform.config_entry.entry_id),
+                self._handle_zone_types,
+            )
+        )
+
+    @callback
+    def _handle_zone_types(self, zone_types: dict[str, ZoneSensorType]) -> None:
+        """Apply a changed sensor type of this zone."""
+        if (sensor_type := zone_types.get(self._config.zone_id)) is None:
+            return
+
+        self._config.sensor_type = sensor_type
+        self._apply_sensor_type(sensor_type)
+        if self._connection.ready:
+            self._rendered = self._render()
+        self._dispatcher.async_schedule(self, immediate=True)
+
+    def _apply_sensor_type(self, sensor_type: ZoneSensorType) -> None:
+        """Switch the entity to another sensor type."""
+        raise NotImplementedError
+
+    def _get_zone(self) -> ZoneData | None:
+        """Get the zone data, None once the zone left the panel."""
+        return self._server.state.zones.get(self._config.zone_id)
+
+
+class Concord4PartitionIndexEntity(Concord4Entity):
+    """Base class for entities derived from the partition zone index."""
+
+    metric_kind = "aggregate"
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        index: Concord4PartitionIndex,
+        serial_number: str,
+        partition_number: int,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(connection, dispatcher, f"p{partition_number}")
+        self._index = index
+        self._partition_number = partition_number
+        self._attr_device_info = DeviceInfo(
+            identifiers={
+                (DOMAIN, alarm_panel_identifier(serial_number, partition_number))
+            },
+        )
+
+    @callback
+    def _async_subscribe(self) -> CALLBACK_TYPE:
+        """Subscribe to zone changes of the partition."""
+        return self._index.async_add_listener(
+            self._partition_number, self._handle_update
+        )
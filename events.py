@@ -0,0 +1,114 @@
+"""Panel event ring buffer for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from collections import deque
+import json
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util import dt as dt_util
+
+from .connection import Concord4Connection
+
+EVENT_LOG_SIZE = 500
+
+# message types worth decoding a second time, checked before parsing a frame
+_RECORDED_MESSAGES = ("zoneStatus", "armingLevel", "zoneData", "partitionData")
+
+
+class Concord4EventLog:
+    """Keep the last `EVENT_LOG_SIZE` panel events of a config entry.
+
+    Zone status and arming level changes are taken from the raw frames, and
+    commands are recorded by the command queues. Events are small tuples in a
+    fixed-size deque, so the memory used stays bounded however busy the panel
+    is, and nothing is formatted unless the log is read.
+    """
+
+    def __init__(self, size: int = EVENT_LOG_SIZE) -> None:
+        """Initialize the log."""
+        self._events: deque[tuple[float, str, dict[str, Any]]] = deque(maxlen=size)
+        self.recorded = 0
+
+    @callback
+    def async_start(self, connection: Concord4Connection) -> CALLBACK_TYPE:
+        """Record the events of a connection, returning a function to stop."""
+        return connection.async_add_frame_listener(self._handle_frame)
+
+    @callback
+    def async_record(self, kind: str, data: dict[str, Any]) -> None:
+        """Add an event."""
+        self._events.append((dt_util.utcnow().timestamp(), kind, data))
+        self.recorded += 1
+
+    def as_list(
+        self, limit: int | None = None, kinds: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the newest events first, optionally only of some kinds."""
+        events = [
+            {
+                "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                "kind": kind,
+                **data,
+            }
+            for timestamp, kind, data in reversed(self._events)
+            if kinds is None or kind in kinds
+        ]
+        return events if limit is None else events[:limit]
+
+    @property
+    def stats(self) -> dict[str, int | None]:
+        """Return the log size and how many events it has seen."""
+        return {
+            "size": len(self._events),
+            "max_size": self._events.maxlen,
+            "recorded": self.recorded,
+        }
+
+    @callback
+    def _handle_frame(self, message: Any, received_at: float) -> None:
+        """Record zone and partition changes carried by a frame."""
+        if isinstance(message, bytes):
+            message = message.decode()
+
+        # full state frames only ever lead with their type
+        if '"state"' in message[:32]:
+            self.async_record("resync", {})
+            return
+
+        if not any(f'"{kind}"' in message for kind in _RECORDED_MESSAGES):
+            return
+
+        try:
+            frame = json.loads(message)["data"]
+            data = frame["data"]
+        except (ValueError, KeyError, TypeError):
+            return
+
+        match frame.get("type"):
+            case "zoneStatus":
+                self.async_record(
+                    "zone",
+                    {
+                        "zone": f"p{data['partitionNumber']}-z{data['zoneNumber']}",
+                        "status": data["zoneStatus"],
+                    },
+                )
+            case "armingLevel":
+                self.async_record(
+                    "arming",
+                    {
+                        "partition": data["partitionNumber"],
+                        "arming_level": data["armingLevel"],
+                    },
+                )
+            case "zoneData":
+                self.async_record(
+                    "zone_data",
+                    {"zone": f"p{data['partitionNumber']}-z{data['zoneNumber']}"},
+                )
+            case "partitionData":
+                self.async_record(
+                    "partition_data", {"partition": data["partitionNumber"]}
+                )
@@ -0,0 +1,124 @@
+"""Domain-wide connection manager for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from .connection import Concord4Connection
+
+DATA_MANAGER = f"{DOMAIN}_manager"
+
+# websocket handshakes allowed to run at the same time across all panels
+MAX_CONCURRENT_CONNECTS = 8
+
+
+class Concord4ConnectionManager:
+    """Share one frame dispatch loop between the connections of all panels.
+
+    Each connection only reads its websocket and queues the frames; a single
+    task decodes them and runs the callbacks, so panels add a reader task each
+    but not a dispatch path. Websocket handshakes go through a semaphore so a
+    restart with many panels does not open every socket at once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self.connect_limiter = asyncio.Semaphore(MAX_CONCURRENT_CONNECTS)
+        self.connections: set[Concord4Connection] = set()
+        self._queue: asyncio.Queue[tuple[Concord4Connection, Any, float]] = (
+            asyncio.Queue()
+        )
+        self._task: asyncio.Task | None = None
+        self.dispatched = 0
+        self.released = 0
+        self.leaked = 0
+
+    @callback
+    def async_register(self, connection: Concord4Connection) -> None:
+        """Add a connection, starting the dispatch loop if needed."""
+        self.connections.add(connection)
+
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_dispatch(), "concord4ws frame dispatch"
+            )
+
+    @callback
+    def async_unregister(self, connection: Concord4Connection) -> None:
+        """Remove a connection, stopping the dispatch loop after the last one."""
+        self.connections.discard(connection)
+
+        if not self.connections and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._queue = asyncio.Queue()
+
+    @callback
+    def async_enqueue(
+        self, connection: Concord4Connection, message: Any, received_at: float
+    ) -> None:
+        """Queue a received frame for dispatch."""
+        self._queue.put_nowait((connection, message, received_at))
+
+    @callback
+    def async_record_release(self, leaked: int) -> None:
+        """Count a released connection and what it left registered."""
+        self.released += 1
+        self.leaked += leaked
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return dispatch, teardown and per-panel connection metrics."""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "dispatched": self.dispatched,
+            "dispatching": self._task is not None,
+            "released": self.released,
+            "leaked_callbacks": self.leaked,
+            "panels": {
+                connection.uri: {
+                    "available": connection.available,
+                    "reconnects": connection.reconnects,
+                    "messages": connection.metrics.messages,
+                    "messages_per_second": connection.metrics.messages_per_second,
+                }
+                for connection in self.connections
+            },
+        }
+
+    async def _async_dispatch(self) -> None:
+        """Hand queued frames to their connections, in arrival order."""
+        queue = self._queue
+
+        while True:
+            connection, message, received_at = await queue.get()
+
+            while True:
+                self.dispatched += 1
+                if connection in self.connections:
+                    # one bad frame must not end dispatch for every panel
+                    try:
+                        connection.handle_frame(message, received_at)
+                    except Exception:  # noqa: BLE001
+                        LOGGER.exception("error handling frame from %s", connection.uri)
+
+                try:
+                    connection, message, received_at = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+
+@callback
+def async_get_manager(hass: HomeAssistant) -> Concord4ConnectionManager:
+    """Return the connection manager, creating it on first use."""
+    if (manager := hass.data.get(DATA_MANAGER)) is None:
+        manager = hass.data[DATA_MANAGER] = Concord4ConnectionManager(hass)
+
+    return manager
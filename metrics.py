@@ -0,0 +1,200 @@
+"""Pipeline metrics for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+from typing import Any
+
+from homeassistant.core import callback
+
+# upper bounds (ms) of the latency histogram buckets, the last bucket is open
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    2,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+
+class _LatencyHistogram:
+    """Fixed-bucket histogram of receive-to-write latencies."""
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    @property
+    def mean_ms(self) -> float | None:
+        return self.total_ms / self.count if self.count else None
+
+    def percentile_ms(self, percentile: float) -> float | None:
+        """Return the upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return None
+
+        rank = percentile / 100 * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "p50_ms": self.percentile_ms(50),
+            "p99_ms": self.percentile_ms(99),
+            "max_ms": self.max_ms,
+            "buckets": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                },
+                "inf": self.buckets[-1],
+            },
+        }
+
+
+class Concord4Metrics:
+    """Track message rate and receive-to-write latency per message type.
+
+    The receive timestamp is taken when the websocket frame reaches the client,
+    and the latency is recorded once the entity state has been written.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.messages = 0
+        self.cpu_seconds = 0.0
+        self._rate = 0.0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._latency: dict[str, _LatencyHistogram] = {}
+        self._commands: dict[str, _LatencyHistogram] = {}
+        self._dispatch_wait: dict[str, _LatencyHistogram] = {}
+        self._heartbeat = _LatencyHistogram()
+        self.heartbeat_rtt_ms: float | None = None
+        self.last_frame_at: float | None = None
+
+    @callback
+    def async_record_frame(self, message: Any, received_at: float) -> None:
+        """Count a received websocket frame."""
+        self.messages += 1
+        self._window_count += 1
+        self.last_frame_at = received_at
+
+        if (elapsed := received_at - self._window_start) >= 1:
+            self._rate = self._window_count / elapsed
+            self._window_start = received_at
+            self._window_count = 0
+
+    @callback
+    def async_record_cpu(self, seconds: float) -> None:
+        """Add CPU time spent decoding frames or writing state."""
+        self.cpu_seconds += seconds
+
+    @property
+    def cpu_ms_per_message(self) -> float | None:
+        """Return the CPU time spent per received message."""
+        return self.cpu_seconds * 1000 / self.messages if self.messages else None
+
+    @property
+    def seconds_since_last_message(self) -> float | None:
+        """Return the time since the last frame from the panel was received."""
+        if self.last_frame_at is None:
+            return None
+
+        return time.monotonic() - self.last_frame_at
+
+    @property
+    def messages_per_second(self) -> float:
+        """Return the message rate over the last full second."""
+        if (elapsed := time.monotonic() - self._window_start) >= 1:
+            return self._window_count / elapsed
+
+        return self._rate
+
+    @callback
+    def async_record_write(self, kind: str, received_at: float) -> None:
+        """Record the latency of a state write caused by a frame."""
+        if (histogram := self._latency.get(kind)) is None:
+            histogram = self._latency[kind] = _LatencyHistogram()
+
+        histogram.record((time.monotonic() - received_at) * 1000)
+
+    @callback
+    def async_record_command(self, name: str, seconds: float) -> None:
+        """Record the round-trip time of a confirmed panel command."""
+        if (histogram := self._commands.get(name)) is None:
+            histogram = self._commands[name] = _LatencyHistogram()
+
+        histogram.record(seconds * 1000)
+
+    @callback
+    def async_record_heartbeat(self, seconds: float) -> None:
+        """Record the round-trip time of a heartbeat ping."""
+        self.heartbeat_rtt_ms = seconds * 1000
+        self._heartbeat.record(self.heartbeat_rtt_ms)
+
+    @callback
+    def async_record_dispatch_wait(self, priority: str, seconds: float) -> None:
+        """Record how long a state write waited in the dispatcher."""
+        if (histogram := self._dispatch_wait.get(priority)) is None:
+            histogram = self._dispatch_wait[priority] = _LatencyHistogram()
+
+        histogram.record(seconds * 1000)
+
+    def mean_latency_ms(self, kind: str) -> float | None:
+        """Return the mean receive-to-write latency of a message type."""
+        if (histogram := self._latency.get(kind)) is None:
+            return None
+
+        return histogram.mean_ms
+
+    def percentile_latency_ms(self, kind: str, percentile: float) -> float | None:
+        """Return a receive-to-write latency percentile of a message type."""
+        if (histogram := self._latency.get(kind)) is None:
+            return None
+
+        return histogram.percentile_ms(percentile)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics."""
+        return {
+            "messages": self.messages,
+            "messages_per_second": self.messages_per_second,
+            "cpu_ms_per_message": self.cpu_ms_per_message,
+            "seconds_since_last_message": self.seconds_since_last_message,
+            "heartbeat": self._heartbeat.as_dict(),
+            "latency": {
+                kind: histogram.as_dict() for kind, histogram in self._latency.items()
+            },
+            "commands": {
+                name: histogram.as_dict() for name, histogram in self._commands.items()
+            },
+            "dispatch_wait": {
+                priority: histogram.as_dict()
+                for priority, histogram in self._dispatch_wait.items()
+            },
+        }
@@ -0,0 +1,80 @@
+"""Replay captured Concord4WS traffic over a local websocket server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from websockets.asyncio.server import Server, ServerConnection, broadcast, serve
+from websockets.exceptions import ConnectionClosed
+
+
+class Concord4ReplayServer:
+    """Websocket server broadcasting captured frames like a Concord4WS server.
+
+    A captured leading state frame is sent to every new connection, the rest
+    is broadcast by `replay` with its recorded timing.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Initialize the server."""
+        self.host = host
+        self.port = port
+        self.connections: set[ServerConnection] = set()
+        self._server: Server | None = None
+        self._state_frame: str | None = None
+
+    async def start(self) -> None:
+        """Start serving, binding a free port if none was given."""
+        self._server = await serve(self._handle_connection, self.host, self.port)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+
+    async def stop(self) -> None:
+        """Close all connections and stop serving."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def state_message(self) -> str | None:
+        """Return the full state message sent to new connections."""
+        return self._state_frame
+
+    def load_capture(self, frames: list[tuple[float, str]]) -> list[tuple[float, str]]:
+        """Serve a leading captured state frame to new connections.
+
+        Returns the remaining frames, to be passed to `replay`.
+        """
+        if frames and json.loads(frames[0][1]).get("type") == "state":
+            self._state_frame = frames[0][1]
+            return frames[1:]
+
+        return frames
+
+    async def replay(self, frames: list[tuple[float, str]], speed: float = 1) -> None:
+        """Broadcast captured frames, keeping their timing scaled by `speed`."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        for offset, frame in frames:
+            if (delay := start + offset / speed - loop.time()) > 0:
+                await asyncio.sleep(delay)
+
+            self._broadcast(frame)
+
+    def _broadcast(self, message: str) -> None:
+        """Send a message to every connection."""
+        broadcast(self.connections, message)
+
+    async def _handle_connection(self, connection: ServerConnection) -> None:
+        """Send the panel state, then keep the connection open."""
+        self.connections.add(connection)
+        try:
+            if (state := self.state_message()) is not None:
+                await connection.send(state)
+            async for _ in connection:
+                pass
+        except ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(connection)
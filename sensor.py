@@ -1,17 +1,33 @@
 """Sensor platform for Concord4WS integration."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import typing
+from typing import Any
 
-from concord4ws import Concord4WSClient
-from concord4ws.types import ZoneData, ZoneStatus
+from concord4ws.types import ZoneStatus
 
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.components.sensor.const import SensorDeviceClass
+from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_ICON, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, LOGGER, alarm_panel_identifier
+from .activity import ACTIVITY_ATTRIBUTES, Concord4ZoneActivity
+from .aggregates import Concord4PartitionIndex
+from .classification import Concord4ZoneClassifier, ZoneSensorType
+from .connection import Concord4Connection
+from .const import CONF_COMPACT_RECORDING, DOMAIN, LOGGER, alarm_panel_identifier
+from .dispatcher import Concord4Dispatcher
+from .entity import (
+    Concord4PartitionIndexEntity,
+    Concord4ZoneConfig,
+    Concord4ZoneEntity,
+)
+from .metrics import Concord4Metrics
+from .topology import SIGNAL_TOPOLOGY_ADDED, active_partitions
 
 
 async def async_setup_entry(
@@ -19,14 +35,178 @@ async def async_setup_entry(
 ):
     """Add sensors for passed config_entry in HA."""
     name: str = hass.data[DOMAIN][config.entry_id]["name"]
-    server: Concord4WSClient = hass.data[DOMAIN][config.entry_id]["server"]
+    connection: Concord4Connection = hass.data[DOMAIN][config.entry_id]["connection"]
+    dispatcher: Concord4Dispatcher = hass.data[DOMAIN][config.entry_id]["dispatcher"]
+    topology: dict[str, Any] = hass.data[DOMAIN][config.entry_id]["topology"]
+    metrics: Concord4Metrics = hass.data[DOMAIN][config.entry_id]["metrics"]
+    index: Concord4PartitionIndex = hass.data[DOMAIN][config.entry_id]["index"]
+    activity: Concord4ZoneActivity = hass.data[DOMAIN][config.entry_id]["activity"]
+    classifier: Concord4ZoneClassifier = hass.data[DOMAIN][config.entry_id][
+        "classifier"
+    ]
+    serial_number: str = topology["panel"]["serial_number"]
 
-    async_add_entities([ZoneSensor(server, name, zone) for zone in server.state.zones])
+    zone_sensor_class = (
+        CompactZoneSensor
+        if config.options.get(CONF_COMPACT_RECORDING, False)
+        else ZoneSensor
+    )
 
+    @callback
+    def async_add_topology(
+        zones: list[dict[str, Any]], partitions: list[dict[str, Any]]
+    ) -> None:
+        """Add sensors for new zones and partitions."""
+        async_add_entities(
+            [
+                zone_sensor_class(
+                    connection,
+                    dispatcher,
+                    name,
+                    serial_number,
+                    zone,
+                    classifier.zone_type(zone["id"], zone["zone_text"].title()),
+                    activity,
+                )
+                for zone in zones
+            ]
+        )
+
+        async_add_entities(
+            [
+                PartitionZoneCountSensor(
+                    connection,
+                    dispatcher,
+                    index,
+                    serial_number,
+                    partition["partition_number"],
+                    kind,
+                )
+                for partition in partitions
+                for kind in ("open", "faulted")
+            ]
+        )
+
+    async_add_topology(topology["zones"], active_partitions(topology))
+    config.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_TOPOLOGY_ADDED.format(config.entry_id), async_add_topology
+        )
+    )
+
+    if topology["partitions"]:
+        partition_number = topology["partitions"][0]["partition_number"]
+        async_add_entities(
+            [
+                Concord4MetricSensor(
+                    metrics, serial_number, partition_number, description
+                )
+                for description in METRIC_SENSORS
+            ]
+        )
+
+
+class PartitionZoneCountSensor(Concord4PartitionIndexEntity, SensorEntity):
+    """Number of open or faulted zones in a partition."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "zones"
+
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        index: Concord4PartitionIndex,
+        serial_number: str,
+        partition_number: int,
+        kind: typing.Literal["open", "faulted"],
+    ):
+        """Initialize the sensor."""
+        super().__init__(connection, dispatcher, index, serial_number, partition_number)
+        self._zones = index.open_zones if kind == "open" else index.faulted_zones
+        self._attr_name = f"{kind.capitalize()} zones"
+        self._attr_unique_id = f"{serial_number}_p{partition_number}_{kind}_zones"
+        self._attr_icon = "mdi:door-open" if kind == "open" else "mdi:alert"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of matching zones."""
+        return len(self._zones(self._partition_number))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the names of the matching zones."""
+        return {"zones": self._index.zone_names(self._zones(self._partition_number))}
+
+    def _render(self) -> frozenset[str]:
+        """Return the matching zones."""
+        return frozenset(self._zones(self._partition_number))
+
+
+@dataclass(frozen=True, kw_only=True)
+class Concord4MetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a Concord4 pipeline metric sensor."""
+
+    value_fn: Callable[[Concord4Metrics], float | None]
+
+
+METRIC_SENSORS: tuple[Concord4MetricSensorEntityDescription, ...] = (
+    Concord4MetricSensorEntityDescription(
+        key="zone_update_latency",
+        name="Zone update latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics.mean_latency_ms("zone"),
+    ),
+    Concord4MetricSensorEntityDescription(
+        key="zone_update_latency_p99",
+        name="Zone update latency p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.percentile_latency_ms("zone", 99),
+    ),
+    Concord4MetricSensorEntityDescription(
+        key="partition_update_latency",
+        name="Partition update latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics.mean_latency_ms("partition"),
+    ),
+    Concord4MetricSensorEntityDescription(
+        key="partition_update_latency_p99",
+        name="Partition update latency p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.percentile_latency_ms("partition", 99),
+    ),
+    Concord4MetricSensorEntityDescription(
+        key="message_rate",
+        name="Message rate",
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics.messages_per_second,
+    ),
+    Concord4MetricSensorEntityDescription(
+        key="heartbeat_rtt",
+        name="Heartbeat round-trip time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics.heartbeat_rtt_ms,
+    ),
+    Concord4MetricSensorEntityDescription(
+        key="last_message_age",
+        name="Time since last message",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: metrics.seconds_since_last_message,
+    ),
+)
 
-ZoneSensorType = typing.Literal[
-    "motion", "window", "glass_break", "sliding_door", "door"
-]
 
 BaseZoneSensorStates = typing.Literal[
     "Faulted", "Alarm", "Trouble", "Bypassed", "Unknown"
@@ -101,113 +281,156 @@ ZoneSensorTypeIconMapping = {
         "Open": "mdi:door-open",
     },
 }
+ZoneSensorTypeRenderMapping: dict[str, dict[ZoneStatus, tuple[str, str | None]]] = {
+    sensor_type: {
+        zone_status: (state, ZoneSensorTypeIconMapping[sensor_type].get(state))
+        for zone_status, state in states.items()
+    }
+    for sensor_type, states in ZoneSensorTypeStatesMapping.items()
+}
 
 
-class _Concord4ZoneConfig:
-    sensor_type: ZoneSensorType
+# one description and options tuple per sensor type, shared by all zone sensors
+ZoneSensorTypeOptions: dict[str, tuple[str, ...]] = {
+    sensor_type: tuple(states.values())
+    for sensor_type, states in ZoneSensorTypeStatesMapping.items()
+}
+ZoneSensorTypeDescriptions: dict[str, SensorEntityDescription] = {
+    sensor_type: SensorEntityDescription(
+        key="zone_status",
+        device_class=SensorDeviceClass.ENUM,
+        native_unit_of_measurement=None,
+        options=list(options),
+    )
+    for sensor_type, options in ZoneSensorTypeOptions.items()
+}
+
 
-    def __init__(
-        self, panel_name: str, sensor_name: str, zone_id: str, partition_number: int
-    ):
-        self.panel_name = panel_name
-        self.sensor_name = sensor_name
-        self.zone_id = zone_id
-        self.partition_number = partition_number
-
-        # assume sensor type based on name
-        if "motion" in sensor_name.lower():
-            self.sensor_type = "motion"
-        elif "window" in sensor_name.lower():
-            self.sensor_type = "window"
-        elif "glass" in sensor_name.lower():
-            self.sensor_type = "glass_break"
-        elif "sliding" in sensor_name.lower():
-            self.sensor_type = "sliding_door"
-        else:
-            self.sensor_type = "door"
-
-
-class ZoneSensor(SensorEntity):
+class ZoneSensor(Concord4ZoneEntity, SensorEntity):
     """Representation of a Zone Sensor."""
 
     device_class: SensorDeviceClass = SensorDeviceClass.ENUM
     _attr_unit_of_measurement = None
-    _attr_has_entity_name = True
-    _attr_should_poll = False
 
-    def __init__(self, server: Concord4WSClient, name: str, zone_id: str):
+    def __init__(
+        self,
+        connection: Concord4Connection,
+        dispatcher: Concord4Dispatcher,
+        name: str,
+        serial_number: str,
+        zone: dict[str, Any],
+        sensor_type: ZoneSensorType,
+        activity: Concord4ZoneActivity | None = None,
+    ):
         """Initialize the sensor."""
 
-        self._server: Concord4WSClient = server
-        zone = self._server.state.zones[zone_id]
+        super().__init__(connection, dispatcher, zone["callback_id"])
+        self._activity = activity
 
-        sensor_name = zone.zone_text.title()
+        sensor_name = zone["zone_text"].title()
         LOGGER.debug("setting up zone sensor: %s", sensor_name)
 
-        self._config = _Concord4ZoneConfig(
+        self._config = Concord4ZoneConfig(
             panel_name=name,
             sensor_name=sensor_name,
-            zone_id=zone_id,
-            partition_number=zone.partition_number,
+            zone_id=zone["id"],
+            partition_number=zone["partition_number"],
+            sensor_type=sensor_type,
         )
 
-        self.entity_description = SensorEntityDescription(
-            name=sensor_name,
-            device_class=SensorDeviceClass.ENUM,
-            key=f"{self._config.zone_id}_zone_status",
-            native_unit_of_measurement=None,
-            options=list(
-                ZoneSensorTypeStatesMapping[self._config.sensor_type].values()
-            ),
-        )
+        self.entity_description = ZoneSensorTypeDescriptions[sensor_type]
+        self._attr_name = sensor_name
         self._attr_unique_id: str = (
-            f"{self._server.state.panel.serial_number}_{self.entity_description.key}"
+            f"{serial_number}_{self._config.zone_id}_zone_status"
         )
-
-    @property
-    def device_info(self):
-        """Return information to link this entity with the correct device."""
-        return DeviceInfo(
+        self._attr_device_info = DeviceInfo(
             identifiers={
                 (
                     DOMAIN,
                     alarm_panel_identifier(
-                        self._server.state.panel.serial_number,
-                        self._config.partition_number,
+                        serial_number, self._config.partition_number
                     ),
                 )
             },
         )
-
-    @property
-    def available(self):
-        """Return if the sensor data are available."""
-        return self._server.connected
-
-    async def async_added_to_hass(self):
-        """Run when this Entity has been added to HA."""
-        self._server.register_callback(
-            self._get_zone().callback_id(), self.async_write_ha_state
-        )
-
-    async def async_will_remove_from_hass(self):
-        """Entity being removed from hass."""
-        self._server.remove_callback(
-            self._get_zone().callback_id(), self.async_write_ha_state
-        )
+        self._render_table = ZoneSensorTypeRenderMapping[sensor_type]
 
     @property
     def state(self):
         """Return the state of the sensor."""
-        return ZoneSensorTypeStatesMapping[self._config.sensor_type][
-            self._get_zone().zone_status
-        ]
+        return self._render()[0]
 
     @property
     def icon(self) -> str | None:
         """Icon of the sensor, based on status and inferred type."""
-        return ZoneSensorTypeIconMapping[self._config.sensor_type][self.state]
+        if not self._connection.ready:
+            return None
+
+        return self._render()[1]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the activity counters of the zone."""
+        if self._activity is None:
+            return None
+
+        return self._activity.attributes(self._config.zone_id)
+
+    def _apply_sensor_type(self, sensor_type: ZoneSensorType) -> None:
+        """Switch the description and render table to another sensor type."""
+        self.entity_description = ZoneSensorTypeDescriptions[sensor_type]
+        self._render_table = ZoneSensorTypeRenderMapping[sensor_type]
 
-    def _get_zone(self) -> ZoneData:
-        """Get the zone data."""
-        return self._server.state.zones[self._config.zone_id]
+    def _render(self) -> tuple[str | None, str | None]:
+        """Return the (state, icon) pair for the current zone status."""
+        if (zone := self._get_zone()) is None:
+            return None, None
+
+        return self._render_table[zone.zone_status]
+
+
+class CompactZoneSensor(ZoneSensor):
+    """Zone sensor that keeps its icon and activity counters out of the recorder.
+
+    The icon follows the state, and the counters change with every trip, so
+    each recorded state would otherwise carry a new attributes row. The
+    options are never recorded for sensors.
+    """
+
+    _unrecorded_attributes = frozenset({ATTR_ICON} | ACTIVITY_ATTRIBUTES)
+
+
+class Concord4MetricSensor(SensorEntity):
+    """Diagnostic sensor exposing a pipeline metric, polled by HA.
+
+    Metrics change with every frame, so pushing them would add a state write
+    per frame; they are read at the 30 s scan interval instead, which bounds
+    how current the rate and message age sensors are.
+    """
+
+    entity_description: Concord4MetricSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        metrics: Concord4Metrics,
+        serial_number: str,
+        partition_number: int,
+        description: Concord4MetricSensorEntityDescription,
+    ):
+        """Initialize the sensor."""
+        self._metrics = metrics
+        self.entity_description = description
+        self._attr_unique_id = f"{serial_number}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={
+                (DOMAIN, alarm_panel_identifier(serial_number, partition_number))
+            },
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current metric value."""
+        return self.entity_description.value_fn(self._metrics)
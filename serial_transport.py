@@ -0,0 +1,210 @@
+"""Direct serial transport to the Concord 4 automation module.
+
+Talks to the panel's automation module instead of going through a Concord4WS
+server, removing a network hop and a process from the event path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import json
+import termios
+import time
+
+from concord4ws import Concord4WSClient
+import serial
+import serial_asyncio_fast
+
+from homeassistant.core import HomeAssistant
+
+from .automation_module import (
+    ACK,
+    CMD_EQPT_LIST_REQUEST,
+    CMD_KEYPRESS,
+    CMD_PANEL_TYPE,
+    EQPT_LIST_ALL,
+    EQPT_LIST_PARTITIONS,
+    NAK,
+    Concord4FrameDecoder,
+    Concord4SerialPanel,
+    KeypressCodes,
+    encode_frame,
+)
+from .connection import Concord4Connection
+from .const import LOGGER
+from .manager import Concord4ConnectionManager
+from .metrics import Concord4Metrics
+
+BAUDRATE = 9600
+PROBE_TIMEOUT = 5
+
+
+class Concord4SerialLink:
+    """Frame, acknowledge and send over an open serial port.
+
+    Takes the place of the client websocket: JSON commands passed to `send`
+    are turned into automation module keypress frames.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Initialize the link."""
+        self._reader = reader
+        self._writer = writer
+        self._decoder = Concord4FrameDecoder()
+        self._reply: asyncio.Future[None] | None = None
+
+    async def frames(self) -> AsyncIterator[tuple[bytes, float]]:
+        """Yield received payloads with the time they were read."""
+        while data := await self._reader.read(1024):
+            received_at = time.monotonic()
+
+            for result in self._decoder.feed(data):
+                if isinstance(result, bytes):
+                    self._writer.write(bytes([ACK]))
+                    yield result, received_at
+                elif result is None:
+                    LOGGER.debug("corrupt frame from panel")
+                    self._writer.write(bytes([NAK]))
+                else:
+                    if result == NAK:
+                        LOGGER.debug("panel rejected a frame")
+                    if self._reply is not None and not self._reply.done():
+                        self._reply.set_result(None)
+
+    async def write_frame(self, payload: bytes) -> None:
+        """Send a payload to the panel."""
+        self._writer.write(encode_frame(payload))
+        await self._writer.drain()
+
+    async def request_equipment_list(self) -> None:
+        """Ask the panel for its full zone and partition list."""
+        await self.write_frame(bytes([CMD_EQPT_LIST_REQUEST, EQPT_LIST_ALL]))
+
+    async def send(self, message: str) -> None:
+        """Send a Concord4WS JSON command as keypresses."""
+        frame = json.loads(message)
+        if frame.get("type") == "getState":
+            await self.request_equipment_list()
+            return
+
+        command = frame["data"]
+        params = command.get("params")
+
+        if command["message"] == "keypress":
+            partition, keys = params
+        elif command["message"] == "arm":
+            partition = params.get("partition") or 1
+            keys = [
+                *(["5"] if params.get("level") == "silent" else []),
+                "2" if params["mode"] == "stay" else "3",
+                *params["code"],
+                *(["4"] if params.get("level") == "instant" else []),
+            ]
+        elif command["message"] == "disarm":
+            partition = params.get("partition") or 1
+            keys = ["1", *params["code"]]
+        else:
+            LOGGER.warning("%s is not supported over serial", command["message"])
+            return
+
+        await self.write_frame(
+            bytes([CMD_KEYPRESS, partition, 0, *(KeypressCodes[key] for key in keys)])
+        )
+
+    async def ping(self) -> asyncio.Future[None]:
+        """Request the partition list, returning a future set on reply.
+
+        The protocol has no no-op command, so the smallest read-only request
+        is sent; the panel answers every frame with an ACK or a NAK, and
+        either proves it is alive.
+        """
+        if self._reply is None or self._reply.done():
+            self._reply = asyncio.get_running_loop().create_future()
+
+        await self.write_frame(bytes([CMD_EQPT_LIST_REQUEST, EQPT_LIST_PARTITIONS]))
+        return self._reply
+
+    async def close(self) -> None:
+        """Close the serial port."""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def async_open_serial(device: str) -> Concord4SerialLink:
+    """Open the automation module serial port.
+
+    pyserial raises termios.error, which is not an OSError, when the port
+    rejects its settings; it is raised as a SerialException instead, so the
+    connection backs off and retries as it does for any other port error.
+    """
+    try:
+        reader, writer = await serial_asyncio_fast.open_serial_connection(
+            url=device, baudrate=BAUDRATE, bytesize=8, parity="O", stopbits=1
+        )
+    except termios.error as err:
+        raise serial.SerialException(f"cannot configure {device}: {err}") from err
+
+    return Concord4SerialLink(reader, writer)
+
+
+async def async_probe_serial(device: str, timeout: float = PROBE_TIMEOUT) -> str | None:
+    """Return the panel serial on `device`, or None if no panel answered in time."""
+    try:
+        link = await async_open_serial(device)
+    except OSError:
+        return None
+
+    panel = Concord4SerialPanel()
+    try:
+        async with asyncio.timeout(timeout):
+            await link.request_equipment_list()
+            async for payload, _ in link.frames():
+                panel.handle(payload)
+                if payload[0] == CMD_PANEL_TYPE:
+                    return panel.panel["serialNumber"]
+    except (OSError, TimeoutError):
+        return None
+    finally:
+        await link.close()
+
+    return None
+
+
+class Concord4SerialConnection(Concord4Connection):
+    """Supervise a panel reached through its automation module serial port."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        manager: Concord4ConnectionManager,
+        server: Concord4WSClient,
+        metrics: Concord4Metrics,
+        device: str,
+    ) -> None:
+        """Initialize the connection."""
+        super().__init__(hass, manager, server, metrics)
+        self.device = device
+
+    @property
+    def uri(self) -> str:
+        """Return the serial device of the panel."""
+        return f"serial://{self.device}"
+
+    async def _async_session(self) -> None:
+        """Open the port, load the equipment list and queue panel messages."""
+        async with self._manager.connect_limiter:
+            link = await async_open_serial(self.device)
+
+        panel = Concord4SerialPanel()
+        try:
+            self._set_transport(link)
+            await link.request_equipment_list()
+
+            async for payload, received_at in link.frames():
+                for message in panel.handle(payload):
+                    self._manager.async_enqueue(self, message, received_at)
+        finally:
+            await link.close()
@@ -0,0 +1,187 @@
+"""Domain services for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from functools import partial
+import os
+
+import voluptuous as vol
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .capture import Concord4CaptureRecorder, read_capture
+from .const import DOMAIN, LOGGER
+from .replay import Concord4ReplayServer
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_HOST = "host"
+ATTR_PATH = "path"
+ATTR_PORT = "port"
+ATTR_SPEED = "speed"
+
+DATA_REPLAY = f"{DOMAIN}_replay"
+# seconds a replay server waits for a client before it is stopped
+REPLAY_CONNECT_TIMEOUT = 300
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_PATH): cv.string,
+    }
+)
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+REPLAY_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_HOST, default="127.0.0.1"): cv.string,
+        vol.Optional(ATTR_PORT, default=8090): cv.port,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.01, max=1000)
+        ),
+    }
+)
+
+
+def _get_entry_data(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """Return the runtime data of the config entry targeted by a call."""
+    if (data := hass.data.get(DOMAIN, {}).get(call.data[ATTR_CONFIG_ENTRY_ID])) is None:
+        raise ServiceValidationError(
+            f"Config entry {call.data[ATTR_CONFIG_ENTRY_ID]} is not loaded"
+        )
+
+    return data
+
+
+def _default_capture_path(hass: HomeAssistant) -> str:
+    """Return a timestamped capture file in the local media directory."""
+    media_dir = hass.config.media_dirs.get("local", hass.config.path("media"))
+
+    return os.path.join(
+        media_dir, DOMAIN, f"concord4ws_{datetime.now():%Y%m%d_%H%M%S}.jsonl.gz"
+    )
+
+
+async def _async_check_path(hass: HomeAssistant, path: str) -> str:
+    """Resolve a capture path relative to the config directory."""
+    path = hass.config.path(path)
+
+    if not await hass.async_add_executor_job(hass.config.is_allowed_path, path):
+        raise ServiceValidationError(f"Access to {path} is not allowed")
+
+    return path
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's domain services."""
+
+    async def start_capture(call: ServiceCall) -> None:
+        data = _get_entry_data(hass, call)
+
+        if data.get("capture") is not None:
+            raise ServiceValidationError(f"Already capturing to {data['capture'].path}")
+
+        path = await _async_check_path(
+            hass, call.data.get(ATTR_PATH) or _default_capture_path(hass)
+        )
+        try:
+            await hass.async_add_executor_job(
+                partial(os.makedirs, os.path.dirname(path), exist_ok=True)
+            )
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot create capture {path}: {err}") from err
+
+        data["capture"] = Concord4CaptureRecorder(
+            hass,
+            hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID]),
+            data["connection"],
+            path,
+        )
+        data["capture"].start()
+        LOGGER.info("capturing Concord4WS traffic to %s", path)
+
+    async def stop_capture(call: ServiceCall) -> None:
+        data = _get_entry_data(hass, call)
+
+        if (capture := data.get("capture")) is None:
+            raise ServiceValidationError("No capture in progress")
+
+        data["capture"] = None
+        await capture.async_stop()
+        LOGGER.info("captured %s frames to %s", capture.frames, capture.path)
+
+    async def replay_capture(call: ServiceCall) -> None:
+        path = await _async_check_path(hass, call.data[ATTR_PATH])
+
+        if not await hass.async_add_executor_job(os.path.isfile, path):
+            raise ServiceValidationError(f"Capture {path} does not exist")
+
+        await _async_stop_replay(hass)
+
+        try:
+            frames = await hass.async_add_executor_job(read_capture, path)
+        except (OSError, ValueError) as err:
+            raise HomeAssistantError(f"Cannot read capture {path}: {err}") from err
+
+        server = Concord4ReplayServer(call.data[ATTR_HOST], call.data[ATTR_PORT])
+        frames = server.load_capture(frames)
+        await server.start()
+
+        async def replay() -> None:
+            try:
+                async with asyncio.timeout(REPLAY_CONNECT_TIMEOUT):
+                    while not server.connections:
+                        await asyncio.sleep(0.5)
+            except TimeoutError:
+                LOGGER.warning(
+                    "nothing connected to %s:%s within %ss, stopping the replay",
+                    server.host,
+                    server.port,
+                    REPLAY_CONNECT_TIMEOUT,
+                )
+                if hass.data.get(DATA_REPLAY, (None,))[0] is server:
+                    del hass.data[DATA_REPLAY]
+                await server.stop()
+                return
+
+            await server.replay(frames, call.data[ATTR_SPEED])
+            LOGGER.info("finished replaying %s", path)
+
+        hass.data[DATA_REPLAY] = (
+            server,
+            hass.async_create_background_task(replay(), "concord4ws replay"),
+        )
+        LOGGER.info("replaying %s on %s:%s", path, server.host, server.port)
+
+    async def stop_replay(call: ServiceCall) -> None:
+        await _async_stop_replay(hass)
+
+    async def stop_replay_on_shutdown(event: Event) -> None:
+        await _async_stop_replay(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_replay_on_shutdown)
+
+    hass.services.async_register(
+        DOMAIN, "start_capture", start_capture, schema=START_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "stop_capture", stop_capture, schema=STOP_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "replay_capture", replay_capture, schema=REPLAY_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, "stop_replay", stop_replay)
+
+
+async def _async_stop_replay(hass: HomeAssistant) -> None:
+    """Stop a running replay server."""
+    if (replay := hass.data.pop(DATA_REPLAY, None)) is None:
+        return
+
+    server, task = replay
+    task.cancel()
+    await server.stop()
@@ -0,0 +1,74 @@
+"""Persisted panel topology for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from concord4ws.types import State
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+
+STORAGE_VERSION = 1
+
+
+def snapshot_from_state(state: State) -> dict[str, Any]:
+    """Build a topology snapshot from the live panel state."""
+    return {
+        "panel": {
+            "serial_number": state.panel.serial_number,
+            "panel_type": state.panel.panel_type,
+            "hardware_revision": state.panel.hardware_revision,
+            "software_revision": state.panel.software_revision,
+        },
+        "partitions": [
+            {
+                "partition_number": partition.partition_number,
+                "callback_id": partition.callback_id(),
+                "zones": list(partition.zones),
+            }
+            for partition in state.partitions.values()
+        ],
+        "zones": [
+            {
+                "id": zone_id,
+                "callback_id": zone.callback_id(),
+                "partition_number": zone.partition_number,
+                "zone_number": zone.zone_number,
+                "zone_text": zone.zone_text,
+            }
+            for zone_id, zone in state.zones.items()
+        ],
+    }
+
+
+class Concord4Snapshot:
+    """Load and save the last known panel topology of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._data: dict[str, Any] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the stored topology, if any."""
+        self._data = await self._store.async_load()
+        return self._data
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Save a topology if it differs from the stored one."""
+        if data == self._data:
+            return
+
+        LOGGER.debug("saving panel snapshot for %s", data["panel"]["serial_number"])
+        self._data = data
+        await self._store.async_save(data)
+
+    async def async_remove(self) -> None:
+        """Remove the stored topology."""
+        self._data = None
+        await self._store.async_remove()
@@ -0,0 +1,162 @@
+"""Benchmarks of the frame-to-state path under zone-change storms.
+
+The stand-in server pushes zone changes over a real websocket into an entry set
+up through `async_setup_entry`, so every change is decoded by the client,
+dispatched to the zone sensors, aggregates and alarm panels, and written to the
+state machine. Figures are printed in the terminal summary:
+
+    pytest tests/bench --bench-zones 96 --bench-rate 500 --bench-count 10000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from custom_components.concord4ws.const import DOMAIN, alarm_panel_uid
+from custom_components.concord4ws.diagnostics import async_get_config_entry_diagnostics
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+
+def _idle(data: dict[str, Any], messages: int) -> bool:
+    """Return True once `messages` frames were handled and nothing is pending."""
+    return data["metrics"].messages >= messages and not any(
+        data["dispatcher"].stats["pending"].values()
+    )
+
+
+@pytest.mark.parametrize("paced", [True, False], ids=["paced", "burst"])
+async def test_zone_storm(
+    hass: HomeAssistant,
+    request: pytest.FixtureRequest,
+    stand_in,
+    setup_panel,
+    wait_for,
+    bench_results: list[dict[str, Any]],
+    paced: bool,
+) -> None:
+    """Storm zone changes and report throughput, latency, CPU and memory."""
+    partitions = request.config.getoption("--bench-partitions")
+    zones = request.config.getoption("--bench-zones")
+    count = request.config.getoption("--bench-count")
+    rate = request.config.getoption("--bench-rate") if paced else float("inf")
+
+    server = await stand_in(partitions=partitions, zones=zones)
+    entry = await setup_panel(server)
+    data = hass.data[DOMAIN][entry.entry_id]
+    messages = data["metrics"].messages
+
+    started = time.monotonic()
+    cpu_started = time.process_time()
+    await server.zone_storm(rate, count)
+    await wait_for(
+        lambda: _idle(data, messages + count),
+        timeout=60 + count / rate,
+        message="storm was not handled",
+    )
+    await hass.async_block_till_done()
+    elapsed = time.monotonic() - started
+    cpu = time.process_time() - cpu_started
+
+    # every zone left tripped by the storm is in the partition index
+    index = data["index"]
+    assert {
+        zone_id
+        for number in server.partitions
+        for zone_id in index.open_zones(number)
+    } == {
+        zone_id
+        for zone_id, zone in server.zones.items()
+        if zone["zoneStatus"] == "tripped"
+    }
+
+    metrics = data["metrics"]
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    memory = diagnostics["entity_memory"]
+    entities = sum(group["count"] for group in memory["entities"].values())
+    p99 = metrics.percentile_latency_ms("zone", 99)
+
+    bench_results.append(
+        {
+            "bench": f"zone_storm[{'paced' if paced else 'burst'}]",
+            "partitions": partitions,
+            "zones": zones,
+            "events": count,
+            "events_per_s": count / elapsed,
+            "p50_ms": metrics.percentile_latency_ms("zone", 50),
+            "p99_ms": p99,
+            "cpu_ms_per_event": metrics.cpu_ms_per_message,
+            # includes the in-process stand-in encoding the frames
+            "process_cpu_ms_per_event": cpu * 1000 / count,
+            "bytes_per_entity": memory["total_bytes"] // entities,
+            "writes": data["dispatcher"].writes,
+            "coalesced": data["dispatcher"].coalesced,
+        }
+    )
+
+    if (max_p99 := request.config.getoption("--bench-max-p99-ms")) is not None:
+        assert p99 is not None and p99 <= max_p99
+
+
+async def test_arming_changes(
+    hass: HomeAssistant,
+    request: pytest.FixtureRequest,
+    stand_in,
+    setup_panel,
+    wait_for,
+    bench_results: list[dict[str, Any]],
+) -> None:
+    """Flip arming levels during a zone storm and report partition latency."""
+    partitions = request.config.getoption("--bench-partitions")
+    zones = request.config.getoption("--bench-zones")
+    count = request.config.getoption("--bench-count")
+
+    server = await stand_in(partitions=partitions, zones=zones)
+    entry = await setup_panel(server)
+    data = hass.data[DOMAIN][entry.entry_id]
+    messages = data["metrics"].messages
+    registry = er.async_get(hass)
+    serial_number = server.panel["serialNumber"]
+
+    rate = request.config.getoption("--bench-rate")
+    levels = ("away", "off") * 5
+    storm = hass.async_create_task(server.zone_storm(rate, count))
+    for level in levels:
+        await asyncio.sleep(count / rate / len(levels))
+        for number in server.partitions:
+            server.set_arming_level(number, level)
+    await storm
+
+    await wait_for(
+        lambda: _idle(data, messages + count + len(levels) * partitions),
+        timeout=60 + count / rate,
+        message="arming changes were not handled",
+    )
+    await hass.async_block_till_done()
+
+    for number, partition in server.partitions.items():
+        if not partition["zones"]:
+            continue
+
+        entity_id = registry.async_get_entity_id(
+            "alarm_control_panel", DOMAIN, alarm_panel_uid(serial_number, number)
+        )
+        assert entity_id is not None
+        assert hass.states.get(entity_id).state == "disarmed"
+
+    metrics = data["metrics"]
+    bench_results.append(
+        {
+            "bench": "arming_changes",
+            "partitions": partitions,
+            "zones": zones,
+            "events": count + len(levels) * partitions,
+            "partition_p50_ms": metrics.percentile_latency_ms("partition", 50),
+            "partition_p99_ms": metrics.percentile_latency_ms("partition", 99),
+            "zone_p99_ms": metrics.percentile_latency_ms("zone", 99),
+        }
+    )
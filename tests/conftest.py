@@ -0,0 +1,206 @@
+"""Fixtures for the Concord4 WebSocket tests, benchmarks and soak suites.
+
+The repository is the integration itself, installed by cloning it as
+`custom_components/concord4ws`. Outside such a checkout the tests link it into
+a temporary `custom_components` directory, so Home Assistant loads it the same
+way in both cases.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+import sys
+import tempfile
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+ROOT = Path(__file__).parent.parent
+DOMAIN = "concord4ws"
+
+if ROOT.name == DOMAIN and ROOT.parent.name == "custom_components":
+    sys.path.insert(0, str(ROOT.parent.parent))
+else:
+    _config_dir = Path(tempfile.mkdtemp(prefix="concord4ws-tests-"))
+    (_config_dir / "custom_components").mkdir()
+    (_config_dir / "custom_components" / "__init__.py").touch()
+    (_config_dir / "custom_components" / DOMAIN).symlink_to(ROOT)
+    sys.path.insert(0, str(_config_dir))
+
+# pytest puts this directory on sys.path, the stand-in is a test module
+from stand_in import (  # noqa: E402
+    MAX_PARTITIONS,
+    MAX_ZONES,
+    Concord4SerialStandIn,
+    Concord4StandInServer,
+)
+
+# figures printed after the run, one row per benchmark
+BENCH_RESULTS: list[dict[str, Any]] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options scaling the benchmark and soak runs."""
+    group = parser.getgroup("concord4ws")
+    group.addoption(
+        "--bench-partitions",
+        type=int,
+        default=MAX_PARTITIONS,
+        help="partitions of the benchmarked panel",
+    )
+    group.addoption(
+        "--bench-zones",
+        type=int,
+        default=MAX_ZONES,
+        help="zones of the benchmarked panel",
+    )
+    group.addoption(
+        "--bench-rate",
+        type=float,
+        default=200,
+        help="zone changes per second of the paced storm",
+    )
+    group.addoption(
+        "--bench-count", type=int, default=2000, help="zone changes per storm"
+    )
+    group.addoption(
+        "--bench-max-p99-ms",
+        type=float,
+        default=None,
+        help="fail a benchmark whose p99 zone latency exceeds this",
+    )
+    group.addoption(
+        "--soak-cycles", type=int, default=1000, help="entry reloads per soak run"
+    )
+    group.addoption(
+        "--soak-max-rss-growth-mb",
+        type=float,
+        default=32,
+        help="fail a soak run whose RSS grew by more than this after warmup",
+    )
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    """Print the benchmark figures."""
+    if not BENCH_RESULTS:
+        return
+
+    terminalreporter.section("concord4ws benchmarks")
+    for result in BENCH_RESULTS:
+        terminalreporter.write_line(
+            "  ".join(f"{key}={_format(value)}" for key, value in result.items())
+        )
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def bench_results() -> list[dict[str, Any]]:
+    """Return the list benchmark figures are reported through."""
+    return BENCH_RESULTS
+
+
+@pytest.fixture
+async def stand_in(
+    socket_enabled: None,
+) -> AsyncGenerator[Callable[..., Awaitable[Concord4StandInServer]]]:
+    """Return a factory starting stand-in servers, stopped after the test.
+
+    With `serial` the panel is served on a pseudo-terminal instead.
+    """
+    servers: list[Concord4StandInServer] = []
+
+    async def start(
+        partitions: int = 1, zones: int = 8, serial: bool = False, **kwargs: Any
+    ) -> Concord4StandInServer:
+        server_class = Concord4SerialStandIn if serial else Concord4StandInServer
+        server = server_class(partitions=partitions, zones=zones, **kwargs)
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        await server.stop()
+
+
+@pytest.fixture
+def entity_id(hass: HomeAssistant) -> Callable[[str, str], str]:
+    """Return a helper looking up an entity id by platform and unique id."""
+    registry = er.async_get(hass)
+
+    def lookup(platform: str, unique_id: str) -> str:
+        entity_id = registry.async_get_entity_id(platform, DOMAIN, unique_id)
+        assert entity_id is not None, f"no {platform} entity {unique_id}"
+        return entity_id
+
+    return lookup
+
+
+@pytest.fixture
+def wait_for() -> Callable[..., Awaitable[None]]:
+    """Return a helper polling a condition until it holds."""
+
+    async def wait(
+        condition: Callable[[], bool], timeout: float = 10, message: str = ""
+    ) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                while not condition():
+                    await asyncio.sleep(0.01)
+        except TimeoutError:
+            message = message or f"condition not met in {timeout}s"
+            raise AssertionError(message) from None
+
+    return wait
+
+
+@pytest.fixture
+async def setup_panel(
+    hass: HomeAssistant,
+) -> AsyncGenerator[Callable[..., Awaitable[MockConfigEntry]]]:
+    """Return a helper setting up an entry for a stand-in, unloaded after the test."""
+    entries: list[MockConfigEntry] = []
+
+    async def setup(
+        server: Concord4StandInServer, options: dict[str, Any] | None = None
+    ) -> MockConfigEntry:
+        if isinstance(server, Concord4SerialStandIn):
+            data = {"name": "Stand-in", "transport": "serial", "device": server.device}
+        else:
+            data = {"name": "Stand-in", "host": server.host, "port": server.port}
+
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title="Stand-in",
+            unique_id=server.panel["serialNumber"],
+            data=data,
+            options=options or {},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entries.append(entry)
+        return entry
+
+    yield setup
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
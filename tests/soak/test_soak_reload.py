@@ -0,0 +1,121 @@
+"""Soak test of config entry reloads against the stand-in server.
+
+Each cycle reloads the entry, waits for the new connection to come up, and
+pushes a zone and an arming change through it. Open file descriptors, live
+tasks, registered callbacks and server-side connections must stay at their
+level after warmup, every replaced connection must be collected, and RSS may
+only grow by a bounded amount:
+
+    pytest tests/soak --soak-cycles 5000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+from pathlib import Path
+import weakref
+
+from custom_components.concord4ws.connection import Concord4Connection
+from custom_components.concord4ws.const import DOMAIN
+from custom_components.concord4ws.manager import DATA_MANAGER
+from custom_components.concord4ws.triggers import async_get_trigger_hub
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+PROC_SELF = Path("/proc/self")
+WARMUP_CYCLES = 20
+
+pytestmark = pytest.mark.skipif(
+    not PROC_SELF.exists(), reason="needs /proc to count descriptors and RSS"
+)
+
+
+def _sample(connection: Concord4Connection, server_connections: int) -> dict[str, int]:
+    """Return the resource counts that must not grow across reloads."""
+    gc.collect()
+    callbacks = connection.server._callbacks  # noqa: SLF001
+
+    return {
+        "fds": len(os.listdir(PROC_SELF / "fd")),
+        "tasks": len(asyncio.all_tasks()),
+        "callbacks": sum(len(registered) for registered in callbacks.values()),
+        "listeners": len(connection._listeners)  # noqa: SLF001
+        + len(connection._frame_listeners)  # noqa: SLF001
+        + len(connection._topology_listeners),  # noqa: SLF001
+        "server_connections": server_connections,
+    }
+
+
+def _rss() -> int:
+    """Return the resident set size in bytes."""
+    pages = int((PROC_SELF / "statm").read_text().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+async def test_reload_soak(
+    hass: HomeAssistant,
+    request: pytest.FixtureRequest,
+    stand_in,
+    setup_panel,
+    wait_for,
+) -> None:
+    """Reload an entry many times without leaking sockets, tasks or callbacks."""
+    cycles = request.config.getoption("--soak-cycles")
+    max_growth = request.config.getoption("--soak-max-rss-growth-mb") * 1024 * 1024
+
+    server = await stand_in(partitions=2, zones=16)
+    entry = await setup_panel(server)
+    serial_number = server.panel["serialNumber"]
+    manager = hass.data[DATA_MANAGER]
+
+    # trigger listeners outlive reloads and attach to every new connection
+    remove_trigger = async_get_trigger_hub(hass).async_add_listener(
+        serial_number, "p1", "armed_away", lambda: None
+    )
+
+    replaced: list[weakref.ref[Concord4Connection]] = []
+    baseline: dict[str, int] | None = None
+    baseline_rss = 0
+
+    for cycle in range(cycles):
+        replaced.append(weakref.ref(hass.data[DOMAIN][entry.entry_id]["connection"]))
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        connection = hass.data[DOMAIN][entry.entry_id]["connection"]
+        await wait_for(
+            lambda connection=connection: (
+                connection.available and len(server.connections) == 1
+            ),
+            message=f"connection did not come back after reload {cycle}",
+        )
+
+        messages = connection.metrics.messages
+        server.set_zone_status("p1-z1", "tripped" if cycle % 2 else "normal")
+        server.set_arming_level(1, "away" if cycle % 2 else "off")
+        await wait_for(
+            lambda connection=connection, messages=messages: (
+                connection.metrics.messages >= messages + 2
+            )
+        )
+        await hass.async_block_till_done()
+
+        if cycle + 1 == WARMUP_CYCLES:
+            baseline = _sample(connection, len(server.connections))
+            baseline_rss = _rss()
+        elif baseline is not None and (cycle + 1) % 100 == 0:
+            assert _sample(connection, len(server.connections)) == baseline, cycle
+
+    if baseline is not None:
+        assert _sample(connection, len(server.connections)) == baseline
+        assert _rss() - baseline_rss <= max_growth
+
+    remove_trigger()
+
+    gc.collect()
+    assert [ref for ref in replaced if ref() is not None] == []
+    assert manager.stats["released"] == cycles
+    assert manager.stats["leaked_callbacks"] == 0
@@ -0,0 +1,367 @@
+"""Local stand-in for a Concord4WS server.
+
+Serves a synthetic panel over the same websocket protocol as the real
+Concord4WS server, so the integration can be driven through its normal setup
+and callback path. `Concord4SerialStandIn` puts the panel behind a
+pseudo-terminal speaking the automation module protocol instead. Both can
+`stall`, going silent like a half-open connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import pty
+import random
+import tty
+from typing import Any
+
+from custom_components.concord4ws.automation_module import (
+    ACK,
+    CMD_EQPT_LIST_DONE,
+    CMD_EQPT_LIST_REQUEST,
+    CMD_EVENT,
+    CMD_KEYPRESS,
+    CMD_PANEL_TYPE,
+    CMD_PARTITION_DATA,
+    CMD_ZONE_DATA,
+    CMD_ZONE_STATUS,
+    EQPT_LIST_PARTITIONS,
+    SUBCMD_ARMING_LEVEL,
+    ArmingLevels,
+    Concord4FrameDecoder,
+    KeypressCodes,
+    PanelTypes,
+    TextTokens,
+    ZoneStatusBits,
+    ZoneTypes,
+    encode_frame,
+)
+from custom_components.concord4ws.replay import Concord4ReplayServer
+from websockets.asyncio.server import ServerConnection, broadcast
+
+# limits of a Concord 4 panel
+MAX_PARTITIONS = 6
+MAX_ZONES = 96
+
+ZONE_TEXTS = ("Front Door", "Back Window", "Hallway Motion", "Glass Break", "Slider")
+
+
+class Concord4StandInServer(Concord4ReplayServer):
+    """In-process fake Concord4WS server with a synthetic panel."""
+
+    def __init__(
+        self,
+        partitions: int = 1,
+        zones: int = 8,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        serial_number: str = "stand-in",
+    ) -> None:
+        """Initialize the server with an evenly partitioned panel."""
+        if not 1 <= partitions <= MAX_PARTITIONS:
+            raise ValueError(f"partitions must be between 1 and {MAX_PARTITIONS}")
+        if not 1 <= zones <= MAX_ZONES:
+            raise ValueError(f"zones must be between 1 and {MAX_ZONES}")
+
+        super().__init__(host, port)
+        self._stalled: set[ServerConnection] = set()
+
+        self.panel = {
+            "panelType": "concord",
+            "hardwareRevision": "stand-in",
+            "softwareRevision": "stand-in",
+            "serialNumber": serial_number,
+        }
+        self.partitions: dict[int, dict[str, Any]] = {
+            number: {
+                "partitionNumber": number,
+                "areaNumber": 0,
+                "armingLevel": "off",
+                "zones": [],
+            }
+            for number in range(1, partitions + 1)
+        }
+        self.zones: dict[str, dict[str, Any]] = {}
+
+        for number in range(1, zones + 1):
+            partition = (number - 1) % partitions + 1
+            zone_id = f"p{partition}-z{number}"
+            self.zones[zone_id] = {
+                "partitionNumber": partition,
+                "areaNumber": 0,
+                "groupNumber": 0,
+                "zoneNumber": number,
+                "zoneType": "hardwired",
+                "zoneStatus": "normal",
+                "zoneText": f"{ZONE_TEXTS[number % len(ZONE_TEXTS)]} {number}",
+            }
+            self.partitions[partition]["zones"].append(zone_id)
+
+    def state_message(self) -> str:
+        """Return the full state message sent to new connections."""
+        if self._state_frame is not None:
+            return self._state_frame
+
+        return json.dumps(
+            {
+                "type": "state",
+                "data": {
+                    "panel": self.panel,
+                    "zones": self.zones,
+                    "partitions": self.partitions,
+                    "groups": {},
+                },
+            }
+        )
+
+    def stall(self) -> None:
+        """Go silent on open connections without closing them.
+
+        Nothing is read from or sent to the connected clients, so their pings
+        go unanswered; new connections are still served.
+        """
+        for connection in self.connections - self._stalled:
+            connection.transport.pause_reading()
+            self._stalled.add(connection)
+
+    def resume(self) -> None:
+        """Serve the open connections again after a stall."""
+        for connection in self._stalled & self.connections:
+            connection.transport.resume_reading()
+        self._stalled.clear()
+
+    def send(self, message_type: str, data: dict[str, Any]) -> None:
+        """Broadcast a panel message to every connected client."""
+        self._broadcast(
+            json.dumps(
+                {"type": "message", "data": {"type": message_type, "data": data}}
+            )
+        )
+
+    def set_zone_status(self, zone_id: str, zone_status: str) -> None:
+        """Change a zone status and notify clients."""
+        zone = self.zones[zone_id]
+        zone["zoneStatus"] = zone_status
+
+        self.send(
+            "zoneStatus",
+            {
+                "partitionNumber": zone["partitionNumber"],
+                "areaNumber": zone["areaNumber"],
+                "zoneNumber": zone["zoneNumber"],
+                "zoneStatus": zone_status,
+            },
+        )
+
+    def set_arming_level(self, partition_number: int, arming_level: str) -> None:
+        """Change a partition arming level and notify clients."""
+        partition = self.partitions[partition_number]
+        partition["armingLevel"] = arming_level
+
+        self.send(
+            "armingLevel",
+            {
+                "partitionNumber": partition_number,
+                "areaNumber": partition["areaNumber"],
+                "armingLevel": arming_level,
+            },
+        )
+
+    async def zone_storm(self, rate: float, count: int) -> None:
+        """Toggle random zones `count` times at `rate` changes per second."""
+        zone_ids = list(self.zones)
+        interval = 1 / rate
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        for sent in range(count):
+            zone_id = random.choice(zone_ids)
+            self.set_zone_status(
+                zone_id,
+                "tripped"
+                if self.zones[zone_id]["zoneStatus"] == "normal"
+                else "normal",
+            )
+
+            if (delay := start + (sent + 1) * interval - loop.time()) > 0:
+                await asyncio.sleep(delay)
+
+    def _broadcast(self, message: str) -> None:
+        """Send a message to every connection that is not stalled."""
+        broadcast(self.connections - self._stalled, message)
+
+    async def _handle_connection(self, connection: ServerConnection) -> None:
+        """Serve a connection, forgetting its stall once it closed."""
+        try:
+            await super()._handle_connection(connection)
+        finally:
+            self._stalled.discard(connection)
+
+
+class Concord4SerialStandIn(Concord4StandInServer):
+    """Synthetic panel behind a pseudo-terminal automation module port.
+
+    Answers equipment list requests and acknowledges every frame. Keypresses
+    of the arm, disarm and direct bypass sequences change the panel state when
+    they carry `code`.
+    """
+
+    def __init__(
+        self,
+        partitions: int = 1,
+        zones: int = 8,
+        serial_number: int = 12345678,
+        code: str = "1234",
+    ) -> None:
+        """Initialize the panel."""
+        super().__init__(partitions, zones, serial_number=str(serial_number))
+        self.code = [KeypressCodes[key] for key in code]
+        self.device: str | None = None
+        self.keypresses: list[tuple[int, list[int]]] = []
+        self._decoder = Concord4FrameDecoder()
+        self._master: int | None = None
+        self._slave: int | None = None
+        self._port_stalled = False
+
+    async def start(self) -> None:
+        """Open the pseudo-terminal; `device` is the port to connect to."""
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.device = os.ttyname(self._slave)
+        asyncio.get_running_loop().add_reader(self._master, self._handle_readable)
+
+    async def stop(self) -> None:
+        """Close the pseudo-terminal."""
+        if self._master is not None:
+            asyncio.get_running_loop().remove_reader(self._master)
+            os.close(self._master)
+            os.close(self._slave)
+            self._master = self._slave = None
+
+    def stall(self) -> None:
+        """Stop reading and writing the port, without closing it."""
+        self._port_stalled = True
+
+    def resume(self) -> None:
+        """Answer on the port again after a stall."""
+        self._port_stalled = False
+
+    def send(self, message_type: str, data: dict[str, Any]) -> None:
+        """Write the automation module frame of a panel message."""
+        if message_type == "zoneStatus":
+            self._write(
+                CMD_ZONE_STATUS,
+                data["partitionNumber"],
+                data["areaNumber"],
+                *data["zoneNumber"].to_bytes(2, "big"),
+                _zone_bits(data["zoneStatus"]),
+            )
+        elif message_type == "armingLevel":
+            self._write(
+                CMD_EVENT,
+                SUBCMD_ARMING_LEVEL,
+                data["partitionNumber"],
+                data["areaNumber"],
+                0,
+                0,
+                _reverse(ArmingLevels)[data["armingLevel"]],
+            )
+
+    def _write(self, *payload: int) -> None:
+        """Write a frame to the port."""
+        if self._master is not None and not self._port_stalled:
+            os.write(self._master, encode_frame(bytes(payload)))
+
+    def _handle_readable(self) -> None:
+        """Acknowledge and handle frames written by the integration."""
+        try:
+            data = os.read(self._master, 1024)
+        except OSError:
+            return
+
+        if self._port_stalled:
+            return
+
+        for result in self._decoder.feed(data):
+            if not isinstance(result, bytes):
+                continue
+
+            os.write(self._master, bytes([ACK]))
+            if result[0] == CMD_EQPT_LIST_REQUEST:
+                self._send_equipment_list(result[1] if len(result) > 1 else 0)
+            elif result[0] == CMD_KEYPRESS and len(result) >= 3:
+                self.keypresses.append((result[1], list(result[3:])))
+                self._handle_keys(result[1], list(result[3:]))
+
+    def _send_equipment_list(self, list_type: int) -> None:
+        """Write the panel type, zone data and partition data frames asked for."""
+        if list_type == EQPT_LIST_PARTITIONS:
+            self._send_partitions()
+            return
+
+        self._write(
+            CMD_PANEL_TYPE,
+            _reverse(PanelTypes)[self.panel["panelType"]],
+            1,
+            0,
+            1,
+            0,
+            *int(self.panel["serialNumber"]).to_bytes(4, "big"),
+        )
+        text_tokens = _reverse(TextTokens)
+        for zone in self.zones.values():
+            self._write(
+                CMD_ZONE_DATA,
+                zone["partitionNumber"],
+                zone["areaNumber"],
+                zone["groupNumber"],
+                *zone["zoneNumber"].to_bytes(2, "big"),
+                _reverse(ZoneTypes)[zone["zoneType"]],
+                _zone_bits(zone["zoneStatus"]),
+                *(text_tokens.get(char, 0xFF) for char in zone["zoneText"].upper()),
+            )
+        self._send_partitions()
+
+    def _send_partitions(self) -> None:
+        """Write partition data frames, ending the equipment list."""
+        for partition in self.partitions.values():
+            self._write(
+                CMD_PARTITION_DATA,
+                partition["partitionNumber"],
+                partition["areaNumber"],
+                _reverse(ArmingLevels)[partition["armingLevel"]],
+                0,
+                0,
+            )
+        self._write(CMD_EQPT_LIST_DONE)
+
+    def _handle_keys(self, partition_number: int, keys: list[int]) -> None:
+        """Apply an arm, disarm or bypass sequence entered with the code."""
+        code = len(self.code)
+        if keys[:1] == [KeypressCodes["5"]]:
+            keys = keys[1:]
+
+        if keys[:1] == [KeypressCodes["#"]] and keys[1 : code + 1] == self.code:
+            zones = keys[code + 1 :]
+            for offset in range(0, len(zones) - 2, 3):
+                zone_id = (
+                    f"p{partition_number}-z{zones[offset] * 10 + zones[offset + 1]}"
+                )
+                if zone_id in self.zones:
+                    self.set_zone_status(zone_id, "bypassed")
+        elif keys[1 : code + 1] == self.code:
+            if (level := {1: "off", 2: "home", 3: "away"}.get(keys[0])) is not None:
+                self.set_arming_level(partition_number, level)
+
+
+def _reverse(mapping: dict[int, str]) -> dict[str, int]:
+    """Return the codes of a code to name mapping, keyed by name."""
+    return {name: value for value, name in mapping.items()}
+
+
+def _zone_bits(zone_status: str) -> int:
+    """Return the zone state bitmask of a zone status."""
+    return next((bit for bit, status in ZoneStatusBits if status == zone_status), 0)
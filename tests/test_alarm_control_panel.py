@@ -0,0 +1,132 @@
+"""Tests of the alarm panels against the pty stand-in."""
+
+from __future__ import annotations
+
+from custom_components.concord4ws import commands as commands_module
+from custom_components.concord4ws.commands import Concord4CommandTimeout
+from custom_components.concord4ws.const import CONF_OPTIMISTIC, DOMAIN, alarm_panel_uid
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+SERIAL_NUMBER = "12345678"
+
+
+async def test_optimistic_arm(
+    hass: HomeAssistant, stand_in, setup_panel, entity_id, wait_for
+) -> None:
+    """An optimistic panel settles on the arming level the panel reports."""
+    server = await stand_in(serial=True)
+    await setup_panel(server, {CONF_OPTIMISTIC: True})
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    await hass.services.async_call(
+        "alarm_control_panel",
+        "alarm_arm_away",
+        {"entity_id": panel, "code": "1234"},
+        blocking=True,
+    )
+
+    await wait_for(lambda: hass.states.get(panel).state == "armed_away")
+
+
+async def test_optimistic_rollback(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    stand_in,
+    setup_panel,
+    entity_id,
+    wait_for,
+) -> None:
+    """An optimistic panel shows arming, then rolls back if not confirmed."""
+    monkeypatch.setattr(commands_module, "COMMAND_TIMEOUT", 0.5)
+
+    server = await stand_in(serial=True)
+    await setup_panel(server, {CONF_OPTIMISTIC: True})
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    call = hass.async_create_task(
+        hass.services.async_call(
+            "alarm_control_panel",
+            "alarm_arm_away",
+            {"entity_id": panel, "code": "9999"},
+            blocking=True,
+        )
+    )
+    await wait_for(lambda: hass.states.get(panel).state == "arming")
+
+    with pytest.raises(HomeAssistantError):
+        await call
+
+    await wait_for(lambda: hass.states.get(panel).state == "disarmed")
+    assert server.partitions[1]["armingLevel"] == "off"
+
+
+async def test_bypass_zones(
+    hass: HomeAssistant, stand_in, setup_panel, entity_id
+) -> None:
+    """Zones are bypassed with one sequence entering the code once."""
+    server = await stand_in(serial=True, code="0123")
+    await setup_panel(server)
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "bypass_zones",
+        {"entity_id": panel, "code": "0123", "zones": [5, 2]},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        panel: {"zones": [{"zone": 2, "bypassed": True}, {"zone": 5, "bypassed": True}]}
+    }
+    assert server.keypresses == [(1, [11, 0, 1, 2, 3, 0, 2, 11, 0, 5, 11])]
+
+
+async def test_bypass_zones_wrong_code(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    stand_in,
+    setup_panel,
+    entity_id,
+) -> None:
+    """A bypass that took effect on no zone fails."""
+    monkeypatch.setattr(commands_module, "COMMAND_TIMEOUT", 0.5)
+
+    server = await stand_in(serial=True)
+    await setup_panel(server)
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    with pytest.raises(Concord4CommandTimeout):
+        await hass.services.async_call(
+            DOMAIN,
+            "bypass_zones",
+            {"entity_id": panel, "code": "9999", "zones": [2]},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert server.zones["p1-z2"]["zoneStatus"] == "normal"
+
+
+async def test_bypass_unknown_zone(
+    hass: HomeAssistant, stand_in, setup_panel, entity_id
+) -> None:
+    """Zones outside the partition are rejected before anything is sent."""
+    server = await stand_in(partitions=2, serial=True)
+    await setup_panel(server)
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    # zone 2 is on the second partition
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "bypass_zones",
+            {"entity_id": panel, "code": "1234", "zones": [1, 2]},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert server.keypresses == []
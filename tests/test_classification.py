@@ -0,0 +1,67 @@
+"""Tests of zone classification and per-zone type overrides."""
+
+from __future__ import annotations
+
+from custom_components.concord4ws.classification import (
+    Concord4ZoneClassifier,
+    zone_type_from_name,
+)
+from custom_components.concord4ws.const import CONF_ZONE_TYPES, DOMAIN
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.parametrize(
+    ("name", "zone_type"),
+    [
+        ("Front Door", "door"),
+        ("Hallway Motion", "motion"),
+        ("Back Window", "window"),
+        ("Glass Break", "glass_break"),
+        ("Sliding Door", "sliding_door"),
+        ("Slider", "door"),
+        # an earlier rule wins wherever it matches in the name
+        ("Window Motion", "motion"),
+        ("Sliding Glass", "glass_break"),
+    ],
+)
+def test_zone_type_from_name(name: str, zone_type: str) -> None:
+    """Names are typed by the first rule matching anywhere in them."""
+    assert zone_type_from_name(name) == zone_type
+
+
+def test_classifier_overrides() -> None:
+    """Changing overrides reports only the zones whose type changed."""
+    classifier = Concord4ZoneClassifier({"p1-z2": "window"})
+
+    assert classifier.zone_type("p1-z1", "Back Window 1") == "window"
+    assert classifier.zone_type("p1-z2", "Hallway Motion 2") == "window"
+
+    assert classifier.async_set_overrides(
+        {"p1-z1": "window", "p1-z2": "glass_break"}
+    ) == {"p1-z2": "glass_break"}
+    assert classifier.async_set_overrides({}) == {"p1-z2": "motion"}
+
+
+async def test_override_retypes_zone(
+    hass: HomeAssistant, stand_in, setup_panel, entity_id, wait_for
+) -> None:
+    """An override retypes a zone sensor without reloading the entry."""
+    server = await stand_in()
+    entry = await setup_panel(server)
+    connection = hass.data[DOMAIN][entry.entry_id]["connection"]
+    zone = entity_id("sensor", "stand-in_p1-z1_zone_status")
+    assert hass.states.get(zone).state == "Closed"
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_ZONE_TYPES: {"p1-z1": "motion"}}
+    )
+    await hass.async_block_till_done()
+
+    await wait_for(lambda: hass.states.get(zone).state == "Clear")
+    assert hass.data[DOMAIN][entry.entry_id]["connection"] is connection
+    assert connection.reconnects == 0
+
+    server.set_zone_status("p1-z1", "tripped")
+    await wait_for(lambda: hass.states.get(zone).state == "Tripped")
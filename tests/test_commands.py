@@ -0,0 +1,139 @@
+"""Tests of the partition command queue against the pty stand-in."""
+
+from __future__ import annotations
+
+import asyncio
+
+from concord4ws.types import code_to_keypresses
+from custom_components.concord4ws import commands as commands_module
+from custom_components.concord4ws.commands import Concord4CommandTimeout
+from custom_components.concord4ws.const import DOMAIN, alarm_panel_uid
+import pytest
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+
+SERIAL_NUMBER = "12345678"
+CODE = code_to_keypresses("1234")
+WRONG_CODE = code_to_keypresses("9999")
+
+
+async def test_identical_commands_collapse(
+    hass: HomeAssistant, stand_in, setup_panel
+) -> None:
+    """An arm identical to one waiting in the queue is not sent again."""
+    server = await stand_in(serial=True)
+    entry = await setup_panel(server)
+    queue = hass.data[DOMAIN][entry.entry_id]["commands"][1]
+
+    # the first arm is in flight, the second waits and the third joins it
+    tasks = [hass.async_create_task(queue.async_arm("away", CODE)) for _ in range(3)]
+    await asyncio.gather(*tasks)
+
+    assert queue.stats == {
+        "waiting": 0,
+        "sent": 2,
+        "confirmed": 2,
+        "collapsed": 1,
+        "timed_out": 0,
+        "failed": 0,
+    }
+    assert server.keypresses == [(1, [3, 1, 2, 3, 4])] * 2
+
+
+async def test_commands_are_serialized(
+    hass: HomeAssistant, stand_in, setup_panel
+) -> None:
+    """Concurrent commands of a partition run one after the other."""
+    server = await stand_in(serial=True)
+    entry = await setup_panel(server)
+    queue = hass.data[DOMAIN][entry.entry_id]["commands"][1]
+
+    await asyncio.gather(
+        hass.async_create_task(queue.async_arm("away", CODE)),
+        hass.async_create_task(queue.async_disarm(CODE)),
+    )
+
+    assert queue.confirmed == 2
+    assert server.keypresses == [(1, [3, 1, 2, 3, 4]), (1, [1, 1, 2, 3, 4])]
+    assert server.partitions[1]["armingLevel"] == "off"
+
+
+async def test_timeout_keeps_newer_identical_command(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    stand_in,
+    setup_panel,
+    wait_for,
+) -> None:
+    """A command timing out does not stop later ones collapsing into its twin."""
+    monkeypatch.setattr(commands_module, "COMMAND_TIMEOUT", 0.5)
+
+    server = await stand_in(serial=True)
+    entry = await setup_panel(server)
+    queue = hass.data[DOMAIN][entry.entry_id]["commands"][1]
+
+    tasks = [
+        hass.async_create_task(queue.async_arm("away", WRONG_CODE)),
+        hass.async_create_task(queue.async_arm("stay", WRONG_CODE)),
+        hass.async_create_task(queue.async_arm("away", WRONG_CODE)),
+    ]
+    await wait_for(lambda: queue.timed_out == 1)
+    assert queue.stats["waiting"] == 1
+
+    tasks.append(hass.async_create_task(queue.async_arm("away", WRONG_CODE)))
+    await asyncio.sleep(0)
+    assert queue.collapsed == 1
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, Concord4CommandTimeout) for result in results)
+    assert queue.timed_out == 3
+    assert len(server.keypresses) == 3
+
+
+@pytest.mark.parametrize(
+    ("service", "keys"),
+    [
+        ("alarm_arm_away_instant", [3, 0, 1, 2, 3, 4]),
+        ("alarm_arm_away_silent", [5, 3, 0, 1, 2, 3]),
+    ],
+)
+async def test_arm_services(
+    hass: HomeAssistant,
+    stand_in,
+    setup_panel,
+    entity_id,
+    wait_for,
+    service: str,
+    keys: list[int],
+) -> None:
+    """The instant and silent arm services keep leading zeros of the code."""
+    server = await stand_in(serial=True, code="0123")
+    await setup_panel(server)
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    await hass.services.async_call(
+        DOMAIN, service, {"entity_id": panel, "code": "0123"}, blocking=True
+    )
+
+    assert server.keypresses == [(1, keys)]
+    await wait_for(lambda: hass.states.get(panel).state == "armed_away")
+
+
+async def test_arm_service_rejects_number(
+    hass: HomeAssistant, stand_in, setup_panel, entity_id
+) -> None:
+    """A numeric code that lost its leading zero is rejected, not sent."""
+    server = await stand_in(serial=True, code="0123")
+    await setup_panel(server)
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 1))
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "alarm_arm_away_instant",
+            {"entity_id": panel, "code": 123},
+            blocking=True,
+        )
+
+    assert server.keypresses == []
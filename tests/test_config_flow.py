@@ -0,0 +1,183 @@
+"""Tests of the config flow and LAN discovery against the stand-in server."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+import json
+from unittest.mock import patch
+
+from custom_components.concord4ws import config_flow
+from custom_components.concord4ws.const import DOMAIN
+from custom_components.concord4ws.discovery import (
+    DiscoveredServer,
+    _parse_state,
+    async_discover,
+)
+from custom_components.concord4ws.replay import Concord4ReplayServer
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+
+@pytest.fixture(autouse=True)
+def mock_setup_entry() -> Generator[None]:
+    """Keep created entries from connecting."""
+    with patch("custom_components.concord4ws.async_setup_entry", return_value=True):
+        yield
+
+
+@pytest.fixture
+async def silent_server(socket_enabled: None) -> AsyncGenerator[Concord4ReplayServer]:
+    """Return a server that accepts connections but never sends a state."""
+    server = Concord4ReplayServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        {"type": "state", "data": []},
+        {"type": "state", "data": {"panel": "concord"}},
+        {"type": "message", "data": {}},
+        ["state"],
+    ],
+)
+def test_parse_malformed_state(frame: object) -> None:
+    """Frames that are not a well-formed state are ignored."""
+    assert _parse_state("127.0.0.1", 8080, json.dumps(frame)) is None
+
+
+async def test_discover(stand_in, silent_server: Concord4ReplayServer) -> None:
+    """Only servers sending a panel state are found, others do not fail the scan."""
+    server = await stand_in()
+    malformed = Concord4ReplayServer()
+    malformed.load_capture([(0, json.dumps({"type": "state", "data": {"panel": 1}}))])
+    await malformed.start()
+
+    try:
+        found = await async_discover(
+            ["127.0.0.1"],
+            [server.port, silent_server.port, malformed.port],
+            timeout=0.5,
+        )
+    finally:
+        await malformed.stop()
+
+    assert found == [DiscoveredServer("127.0.0.1", server.port, "stand-in", "concord")]
+
+
+async def _async_start_discovery(hass: HomeAssistant, port: int) -> dict:
+    """Submit the discovery step for a port on localhost."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.MENU
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "discovery"}
+    )
+    assert result["type"] is FlowResultType.FORM
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            config_flow.CONF_SUBNET: "127.0.0.1/32",
+            config_flow.CONF_PORT_START: port,
+            config_flow.CONF_PORT_END: port,
+        },
+    )
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+    assert result["step_id"] == "probe"
+
+    await hass.async_block_till_done()
+    return await hass.config_entries.flow.async_configure(result["flow_id"])
+
+
+async def test_discovery_flow(hass: HomeAssistant, stand_in) -> None:
+    """A discovered server is picked and added with its serial as unique ID."""
+    server = await stand_in()
+
+    result = await _async_start_discovery(hass, server.port)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "pick"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"server": f"127.0.0.1:{server.port}", "name": "House"}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "House"
+    assert result["data"] == {"name": "House", "host": "127.0.0.1", "port": server.port}
+    assert result["result"].unique_id == "stand-in"
+
+
+async def test_discovery_flow_finds_nothing(
+    hass: HomeAssistant, silent_server: Concord4ReplayServer
+) -> None:
+    """Without servers the discovery form is shown again with the last input."""
+    result = await _async_start_discovery(hass, silent_server.port)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "discovery"
+    assert result["errors"] == {"base": "no_servers_found"}
+
+
+async def test_manual_server_slow_to_send_state(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    silent_server: Concord4ReplayServer,
+) -> None:
+    """A server that connects is added even if its state does not arrive."""
+    monkeypatch.setattr(config_flow, "MANUAL_PROBE_TIMEOUT", 0.1)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"name": "House", "host": "127.0.0.1", "port": silent_server.port},
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id is None
+
+
+@pytest.mark.parametrize(
+    ("data", "moved"),
+    [
+        ({"name": "House", "host": "10.0.0.2", "port": 1}, True),
+        ({"name": "House", "transport": "serial", "device": "/dev/ttyUSB0"}, False),
+    ],
+    ids=["same_transport", "other_transport"],
+)
+async def test_manual_configured_panel(
+    hass: HomeAssistant, stand_in, data: dict, moved: bool
+) -> None:
+    """Adding a configured panel again only moves it on its own transport."""
+    server = await stand_in()
+    entry = MockConfigEntry(domain=DOMAIN, unique_id="stand-in", data=data)
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"name": "Other", "host": "127.0.0.1", "port": server.port},
+    )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert dict(entry.data) == (
+        {**data, "host": "127.0.0.1", "port": server.port} if moved else data
+    )
@@ -0,0 +1,46 @@
+"""Tests of the connection heartbeat against stalled stand-in panels."""
+
+from __future__ import annotations
+
+from custom_components.concord4ws import connection as connection_module
+from custom_components.concord4ws.const import DOMAIN
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture(autouse=True)
+def fast_heartbeat(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ping often and give up on a silent link quickly."""
+    monkeypatch.setattr(connection_module, "HEARTBEAT_INTERVAL", 0.05)
+    monkeypatch.setattr(connection_module, "HEARTBEAT_TIMEOUT", 0.05)
+    monkeypatch.setattr(connection_module, "STALE_AFTER", 0.2)
+    monkeypatch.setattr(connection_module, "CLOSE_TIMEOUT", 0.1)
+    monkeypatch.setattr(connection_module, "RECONNECT_BACKOFF_MIN", 0.05)
+
+
+@pytest.mark.parametrize("serial", [False, True], ids=["websocket", "serial"])
+async def test_stalled_panel_reconnects(
+    hass: HomeAssistant, stand_in, setup_panel, wait_for, serial: bool
+) -> None:
+    """A link that goes silent without closing is dropped and reconnected."""
+    server = await stand_in(serial=serial)
+    entry = await setup_panel(server)
+    connection = hass.data[DOMAIN][entry.entry_id]["connection"]
+    assert connection.available
+
+    server.stall()
+    await wait_for(lambda: not connection.available, message="stall was not detected")
+    assert connection.stale_reconnects == 1
+
+    server.resume()
+    await wait_for(lambda: connection.available, message="did not reconnect")
+    assert connection.reconnects >= 1
+    assert connection.last_error == "no frames or heartbeat replies for 0.2s"
+
+    # the fresh link answers the heartbeat, so it is kept
+    stale_reconnects = connection.stale_reconnects
+    seen_at = connection.last_seen_at
+    await wait_for(lambda: connection.last_seen_at > seen_at)
+    assert connection.available
+    assert connection.stale_reconnects == stale_reconnects
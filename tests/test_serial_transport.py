@@ -0,0 +1,74 @@
+"""Tests of the automation module serial transport against the pty stand-in."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from custom_components.concord4ws import connection as connection_module
+from custom_components.concord4ws.const import DOMAIN, alarm_panel_uid
+from custom_components.concord4ws.serial_transport import async_probe_serial
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+SERIAL_NUMBER = "12345678"
+
+
+async def test_probe_serial(stand_in) -> None:
+    """The probe reads the panel serial from the equipment list."""
+    server = await stand_in(serial=True)
+
+    assert await async_probe_serial(server.device) == SERIAL_NUMBER
+
+
+async def test_probe_missing_device(tmp_path: Path) -> None:
+    """A port that cannot be opened is reported as no panel."""
+    assert await async_probe_serial(str(tmp_path / "ttyUSB9")) is None
+
+
+async def test_serial_entry(
+    hass: HomeAssistant, stand_in, setup_panel, entity_id, wait_for
+) -> None:
+    """An entry on the pty panel follows zone changes and arms by keypresses."""
+    server = await stand_in(partitions=2, zones=4, serial=True)
+    entry = await setup_panel(server)
+
+    assert hass.data[DOMAIN][entry.entry_id]["connection"].uri == (
+        f"serial://{server.device}"
+    )
+
+    panel = entity_id("alarm_control_panel", alarm_panel_uid(SERIAL_NUMBER, 2))
+    zone = entity_id("sensor", f"{SERIAL_NUMBER}_p2-z2_zone_status")
+    assert hass.states.get(panel).state == "disarmed"
+    assert hass.states.get(zone).state == "Clear"
+
+    server.set_zone_status("p2-z2", "tripped")
+    await wait_for(lambda: hass.states.get(zone).state == "Tripped")
+
+    await hass.services.async_call(
+        "alarm_control_panel",
+        "alarm_arm_away",
+        {"entity_id": panel, "code": "1234"},
+        blocking=True,
+    )
+    await wait_for(lambda: hass.states.get(panel).state == "armed_away")
+    assert server.keypresses == [(2, [3, 1, 2, 3, 4])]
+
+
+async def test_heartbeat_sends_no_keypresses(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    stand_in,
+    setup_panel,
+    wait_for,
+) -> None:
+    """The heartbeat is answered without entering anything on the panel."""
+    monkeypatch.setattr(connection_module, "HEARTBEAT_INTERVAL", 0.05)
+
+    server = await stand_in(serial=True)
+    entry = await setup_panel(server)
+    connection = hass.data[DOMAIN][entry.entry_id]["connection"]
+
+    await wait_for(lambda: connection.metrics.heartbeat_rtt_ms is not None)
+    assert connection.available
+    assert server.keypresses == []
@@ -0,0 +1,95 @@
+"""Tests of the device trigger hub against the stand-in server."""
+
+from __future__ import annotations
+
+from custom_components.concord4ws import connection as connection_module
+from custom_components.concord4ws.const import DOMAIN
+from custom_components.concord4ws.triggers import async_get_trigger_hub
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+async def test_zone_trigger(
+    hass: HomeAssistant, stand_in, setup_panel, wait_for
+) -> None:
+    """A zone trigger fires on a change, not on a resent unchanged status."""
+    server = await stand_in()
+    entry = await setup_panel(server)
+    metrics = hass.data[DOMAIN][entry.entry_id]["metrics"]
+    hub = async_get_trigger_hub(hass)
+    calls: list[str] = []
+    remove = hub.async_add_listener(
+        "stand-in", "p1-z1", "tripped", lambda: calls.append("tripped")
+    )
+
+    server.set_zone_status("p1-z1", "tripped")
+    await wait_for(lambda: calls == ["tripped"])
+
+    messages = metrics.messages
+    server.set_zone_status("p1-z1", "tripped")
+    await wait_for(lambda: metrics.messages > messages)
+    assert calls == ["tripped"]
+
+    server.set_zone_status("p1-z1", "normal")
+    server.set_zone_status("p1-z1", "tripped")
+    await wait_for(lambda: calls == ["tripped"] * 2)
+    assert hub.fired == 2
+
+    remove()
+    assert hub.stats == {"subscriptions": 0, "listeners": 0, "fired": 2}
+
+
+async def test_zone_trigger_after_reconnect(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    stand_in,
+    setup_panel,
+    wait_for,
+) -> None:
+    """The full state resent after a reconnect does not fire triggers again."""
+    monkeypatch.setattr(connection_module, "RECONNECT_BACKOFF_MIN", 0.05)
+
+    server = await stand_in()
+    entry = await setup_panel(server)
+    connection = hass.data[DOMAIN][entry.entry_id]["connection"]
+    calls: list[str] = []
+    async_get_trigger_hub(hass).async_add_listener(
+        "stand-in", "p1-z1", "tripped", lambda: calls.append("tripped")
+    )
+
+    server.set_zone_status("p1-z1", "tripped")
+    await wait_for(lambda: calls == ["tripped"])
+
+    messages = connection.metrics.messages
+    for websocket in list(server.connections):
+        await websocket.close()
+    await wait_for(lambda: connection.reconnects == 1 and connection.available)
+    await wait_for(lambda: connection.metrics.messages > messages)
+    await hass.async_block_till_done()
+
+    assert calls == ["tripped"]
+
+
+async def test_partition_trigger(
+    hass: HomeAssistant, stand_in, setup_panel, wait_for
+) -> None:
+    """A partition trigger fires when the partition is armed away."""
+    server = await stand_in(partitions=2)
+    await setup_panel(server)
+    calls: list[str] = []
+    hub = async_get_trigger_hub(hass)
+    for callback_id in ("p1", "p2"):
+        hub.async_add_listener(
+            "stand-in",
+            callback_id,
+            "armed_away",
+            lambda callback_id=callback_id: calls.append(callback_id),
+        )
+
+    server.set_arming_level(2, "away")
+    await wait_for(lambda: calls == ["p2"])
+
+    server.set_arming_level(2, "off")
+    server.set_arming_level(1, "away")
+    await wait_for(lambda: calls == ["p2", "p1"])
@@ -0,0 +1,120 @@
+"""Live topology tracking for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .activity import Concord4ZoneActivity
+from .aggregates import Concord4PartitionIndex
+from .connection import Concord4Connection
+from .const import LOGGER
+from .snapshot import Concord4Snapshot, snapshot_from_state
+
+SIGNAL_TOPOLOGY_ADDED = "concord4ws_topology_added_{}"
+SIGNAL_TOPOLOGY_RETIRED = "concord4ws_topology_retired_{}"
+
+
+def active_partitions(topology: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the partitions that have zones, the ones entities are made for."""
+    return [partition for partition in topology["partitions"] if partition["zones"]]
+
+
+class Concord4TopologyTracker:
+    """Add and retire entities as zones and partitions come and go.
+
+    Whenever the panel reports a different set of zones or partitions, the
+    new topology is diffed against the current one. Platforms are signalled
+    with only the added zones and partitions, entities of removed ones retire
+    themselves, and unchanged entities are left alone.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        connection: Concord4Connection,
+        index: Concord4PartitionIndex,
+        activity: Concord4ZoneActivity,
+        snapshot: Concord4Snapshot,
+        topology: dict[str, Any],
+    ) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._connection = connection
+        self._index = index
+        self._activity = activity
+        self._snapshot = snapshot
+        self.topology = topology
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start tracking, returning a function to stop."""
+        if self._connection.ready:
+            self._handle_topology()
+
+        return self._connection.async_add_topology_listener(self._handle_topology)
+
+    @callback
+    def _handle_topology(self) -> None:
+        """Diff the live topology against the current one."""
+        current = self.topology
+        live = snapshot_from_state(self._connection.server.state)
+        if live == current:
+            return
+
+        zones = {zone["id"]: zone for zone in current["zones"]}
+        live_zones = {zone["id"]: zone for zone in live["zones"]}
+        partitions = {p["partition_number"]: p for p in active_partitions(current)}
+        live_partitions = {p["partition_number"]: p for p in active_partitions(live)}
+
+        added_zones = [
+            zone for zone_id, zone in live_zones.items() if zone_id not in zones
+        ]
+        added_partitions = [
+            partition
+            for number, partition in live_partitions.items()
+            if number not in partitions
+        ]
+        retired = {
+            zone["callback_id"]
+            for zone_id, zone in zones.items()
+            if zone_id not in live_zones
+        } | {
+            partition["callback_id"]
+            for number, partition in partitions.items()
+            if number not in live_partitions
+        }
+
+        self.topology = live
+        self._hass.async_create_task(self._snapshot.async_save(live))
+
+        if not added_zones and not added_partitions and not retired:
+            return
+
+        LOGGER.info(
+            "panel topology changed: %s zones and %s partitions added, %s retired",
+            len(added_zones),
+            len(added_partitions),
+            len(retired),
+        )
+
+        removed_zones = [zone_id for zone_id in zones if zone_id not in live_zones]
+        for tracker in (self._index, self._activity):
+            tracker.async_remove_zones(removed_zones)
+            tracker.async_add_zones(added_zones)
+
+        if retired:
+            async_dispatcher_send(
+                self._hass, SIGNAL_TOPOLOGY_RETIRED.format(self._entry_id), retired
+            )
+        if added_zones or added_partitions:
+            async_dispatcher_send(
+                self._hass,
+                SIGNAL_TOPOLOGY_ADDED.format(self._entry_id),
+                added_zones,
+                added_partitions,
+            )
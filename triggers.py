@@ -0,0 +1,197 @@
+"""Domain-wide device trigger hub for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from concord4ws.types import ZoneStatus
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .connection import Concord4Connection
+from .const import DOMAIN
+
+DATA_TRIGGERS = f"{DOMAIN}_triggers"
+
+ZoneStatusTriggers: dict[ZoneStatus, str] = {
+    "normal": "restored",
+    "tripped": "tripped",
+    "faulted": "faulted",
+    "alarm": "alarm",
+    "trouble": "trouble",
+    "bypassed": "bypassed",
+}
+ArmingLevelTriggers: dict[str, str] = {
+    "off": "disarmed",
+    "stay": "armed_home",
+    "home": "armed_home",
+    "night": "armed_home",
+    "away": "armed_away",
+}
+ZONE_TRIGGER_TYPES: tuple[str, ...] = tuple(ZoneStatusTriggers.values())
+PARTITION_TRIGGER_TYPES: tuple[str, ...] = tuple(
+    dict.fromkeys(ArmingLevelTriggers.values())
+)
+
+# listeners of one zone or partition, by trigger type
+_Listeners = dict[str, list[Callable[[], None]]]
+
+
+class Concord4TriggerHub:
+    """Fire device triggers straight from the zone and partition callbacks.
+
+    Listeners are indexed by panel serial and callback id, then by trigger
+    type, so a callback looks up the listeners of its new state in two dict
+    reads. Only zones and partitions with listeners are subscribed to, and a
+    trigger fires only when the state actually changed: the last state is
+    seeded whenever the connection turns available, and a callback arriving
+    before any seed only records the state. Listeners outlive config entry
+    reloads: each loaded panel attaches its connection here.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the hub."""
+        self._listeners: dict[tuple[str, str], _Listeners] = {}
+        self._connections: dict[str, Concord4Connection] = {}
+        self._unsubscribe: dict[tuple[str, str], CALLBACK_TYPE] = {}
+        self._last: dict[tuple[str, str], str | None] = {}
+        self._current: dict[tuple[str, str], Callable[[], str | None]] = {}
+        self.fired = 0
+
+    @callback
+    def async_attach_connection(
+        self, serial_number: str, connection: Concord4Connection
+    ) -> CALLBACK_TYPE:
+        """Fire the triggers of a panel from its connection until detached."""
+        self._connections[serial_number] = connection
+        for key in self._listeners:
+            if key[0] == serial_number:
+                self._subscribe(key)
+
+        @callback
+        def handle_availability() -> None:
+            if not connection.available:
+                return
+
+            for key, current in self._current.items():
+                if key[0] == serial_number:
+                    self._last[key] = current()
+
+        remove_listener = connection.async_add_listener(handle_availability)
+
+        @callback
+        def detach() -> None:
+            remove_listener()
+            if self._connections.get(serial_number) is not connection:
+                return
+
+            for key in [key for key in self._unsubscribe if key[0] == serial_number]:
+                self._unsubscribe.pop(key)()
+                self._current.pop(key, None)
+                self._last.pop(key, None)
+            del self._connections[serial_number]
+
+        return detach
+
+    @callback
+    def async_add_listener(
+        self,
+        serial_number: str,
+        callback_id: str,
+        trigger_type: str,
+        listener: Callable[[], None],
+    ) -> CALLBACK_TYPE:
+        """Call `listener` whenever a zone or partition enters a trigger state."""
+        key = (serial_number, callback_id)
+        if (listeners := self._listeners.get(key)) is None:
+            listeners = self._listeners[key] = {}
+            if serial_number in self._connections:
+                self._subscribe(key)
+
+        listeners.setdefault(trigger_type, []).append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            listeners[trigger_type].remove(listener)
+            if not listeners[trigger_type]:
+                del listeners[trigger_type]
+            if listeners:
+                return
+
+            del self._listeners[key]
+            if (unsubscribe := self._unsubscribe.pop(key, None)) is not None:
+                unsubscribe()
+            self._current.pop(key, None)
+            self._last.pop(key, None)
+
+        return remove_listener
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the number of subscriptions, listeners and fired triggers."""
+        return {
+            "subscriptions": len(self._unsubscribe),
+            "listeners": sum(
+                len(listeners)
+                for by_type in self._listeners.values()
+                for listeners in by_type.values()
+            ),
+            "fired": self.fired,
+        }
+
+    def _subscribe(self, key: tuple[str, str]) -> None:
+        """Register the server callback of a zone or partition."""
+        serial_number, callback_id = key
+        server = self._connections[serial_number].server
+        listeners = self._listeners[key]
+
+        if "-z" in callback_id:
+
+            def current() -> str | None:
+                if (zone := server.state.zones.get(callback_id)) is None:
+                    return None
+                return ZoneStatusTriggers.get(zone.zone_status)
+
+        else:
+            partition_number = int(callback_id[1:])
+
+            def current() -> str | None:
+                if (partition := server.state.partitions.get(partition_number)) is None:
+                    return None
+                return ArmingLevelTriggers.get(partition.arming_level)
+
+        @callback
+        def handle_update() -> None:
+            trigger_type = current()
+            if key not in self._last:
+                # nothing to compare against yet, the panel may be resending
+                self._last[key] = trigger_type
+                return
+            if trigger_type == self._last[key]:
+                return
+
+            self._last[key] = trigger_type
+            for listener in list(listeners.get(trigger_type, ())):
+                self.fired += 1
+                listener()
+
+        self._current[key] = current
+        if self._connections[serial_number].ready:
+            self._last[key] = current()
+
+        server.register_callback(callback_id, handle_update)
+
+        @callback
+        def unsubscribe() -> None:
+            server.remove_callback(callback_id, handle_update)
+
+        self._unsubscribe[key] = unsubscribe
+
+
+@callback
+def async_get_trigger_hub(hass: HomeAssistant) -> Concord4TriggerHub:
+    """Return the trigger hub, creating it on first use."""
+    if (hub := hass.data.get(DATA_TRIGGERS)) is None:
+        hub = hass.data[DATA_TRIGGERS] = Concord4TriggerHub()
+
+    return hub
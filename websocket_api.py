@@ -0,0 +1,50 @@
+"""Websocket API for the Concord4 WebSocket integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .events import EVENT_LOG_SIZE
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_events)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/events",
+        vol.Required("entry_id"): str,
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1, max=EVENT_LOG_SIZE)),
+        vol.Optional("kinds"): [str],
+    }
+)
+@websocket_api.require_admin
+@callback
+def websocket_events(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the latest panel events of a config entry, newest first."""
+    if (data := hass.data.get(DOMAIN, {}).get(msg["entry_id"])) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            **data["events"].stats,
+            "events": data["events"].as_list(msg.get("limit"), msg.get("kinds")),
+        },
+    )